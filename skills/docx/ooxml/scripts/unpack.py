@@ -1,29 +1,298 @@
 #!/usr/bin/env python3
-"""Unpack and format XML contents of Office files (.docx, .pptx, .xlsx)"""
+"""
+Unpack and format XML contents of Office files (.docx, .pptx, .xlsx)
 
+Example usage:
+    python unpack.py <office_file> <output_dir> [--jobs N] [--skip-static-parts]
+"""
+
+import argparse
+import os
 import random
-import sys
-import defusedxml.minidom
+import xml.parsers.expat
 import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-# Get command line arguments
-assert len(sys.argv) == 3, "Usage: python unpack.py <office_file> <output_dir>"
-input_file, output_dir = sys.argv[1], sys.argv[2]
-
-# Extract and format
-output_path = Path(output_dir)
-output_path.mkdir(parents=True, exist_ok=True)
-zipfile.ZipFile(input_file).extractall(output_path)
-
-# Pretty print all XML files
-xml_files = list(output_path.rglob("*.xml")) + list(output_path.rglob("*.rels"))
-for xml_file in xml_files:
-    content = xml_file.read_text(encoding="utf-8")
-    dom = defusedxml.minidom.parseString(content)
-    xml_file.write_bytes(dom.toprettyxml(indent="  ", encoding="ascii"))
-
-# For .docx files, suggest an RSID for tracked changes
-if input_file.endswith(".docx"):
-    suggested_rsid = "".join(random.choices("0123456789ABCDEF", k=8))
-    print(f"Suggested RSID for edit session: {suggested_rsid}")
+from defusedxml.common import EntitiesForbidden, ExternalReferenceForbidden
+
+# Bytes handed to expat per read when pretty-printing
+FORMAT_CHUNK_SIZE = 1 << 16
+
+# Directories whose parts are never hand-edited (anywhere in the part name)
+STATIC_PART_DIRS = {"customXml", "fonts", "theme"}
+STATIC_PART_NAMES = {"fontTable.xml"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Unpack an Office file")
+    parser.add_argument("office_file", help="Office file (.docx/.pptx/.xlsx)")
+    parser.add_argument("output_dir", help="Directory to unpack into")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for pretty-printing (default: 1, 0 = one per CPU)",
+    )
+    parser.add_argument(
+        "--skip-static-parts",
+        action="store_true",
+        help="Leave themes, fonts and customXml parts unformatted",
+    )
+    args = parser.parse_args()
+
+    unpack_document(
+        args.office_file,
+        args.output_dir,
+        jobs=args.jobs,
+        skip_static_parts=args.skip_static_parts,
+    )
+
+    # For .docx files, suggest an RSID for tracked changes
+    if args.office_file.endswith(".docx"):
+        suggested_rsid = "".join(random.choices("0123456789ABCDEF", k=8))
+        print(f"Suggested RSID for edit session: {suggested_rsid}")
+
+
+def unpack_document(input_file, output_dir, jobs=1, skip_static_parts=False):
+    """Extract an Office file and pretty-print its XML parts.
+
+    Args:
+        input_file: Path to the .docx/.pptx/.xlsx file
+        output_dir: Directory to extract into (created if missing)
+        jobs: Worker processes for pretty-printing; 0 means one per CPU
+        skip_static_parts: If True, leave themes, fonts and customXml parts
+            as they are in the archive
+
+    Returns:
+        list: Paths of the XML parts that were pretty-printed
+    """
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(input_file) as zf:
+        zf.extractall(output_path)
+
+    xml_files = [
+        xml_file
+        for pattern in ["*.xml", "*.rels"]
+        for xml_file in output_path.rglob(pattern)
+        if not (skip_static_parts and is_static_part(xml_file, output_path))
+    ]
+
+    jobs = jobs or os.cpu_count() or 1
+    if jobs <= 1 or len(xml_files) <= 1:
+        for xml_file in xml_files:
+            pretty_print_xml(xml_file)
+    else:
+        workers = min(jobs, len(xml_files))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            list(
+                executor.map(
+                    pretty_print_xml,
+                    xml_files,
+                    chunksize=max(1, len(xml_files) // (workers * 4)),
+                )
+            )
+
+    return xml_files
+
+
+def is_static_part(xml_file, unpacked_dir):
+    """Return True for parts that are never hand-edited (themes, fonts, customXml)."""
+    parts = Path(xml_file).relative_to(unpacked_dir).parts
+    return bool(STATIC_PART_DIRS.intersection(parts[:-1])) or (
+        parts[-1] in STATIC_PART_NAMES
+    )
+
+
+def pretty_print_xml(xml_file):
+    """Pretty-print an XML file in place.
+
+    The file is streamed through expat, so memory use depends on nesting
+    depth rather than file size. The output is identical to minidom's
+    toprettyxml(indent="  ", encoding="ascii"): two-space indentation,
+    elements with a single text child kept on one line, and non-ASCII
+    characters written as character references.
+
+    Args:
+        xml_file: Path to the XML file to format
+    """
+    xml_file = Path(xml_file)
+    # Write alongside and swap in, so a parse error leaves the file intact
+    temp_file = xml_file.with_name(xml_file.name + ".formatted")
+    try:
+        with open(xml_file, "rb") as f, open(temp_file, "wb") as out:
+            _XMLPrettyPrinter(out).feed(f)
+        os.replace(temp_file, xml_file)
+    finally:
+        temp_file.unlink(missing_ok=True)
+
+
+class _XMLPrettyPrinter:
+    """Expat handlers that write an indented copy of an XML stream.
+
+    Each open element tracks how many child nodes it has written. A start
+    tag's ">" is deferred until the first child arrives, and a lone text
+    child is held back until the next event shows whether it stays inline
+    (the only child) or goes on its own indented line.
+    """
+
+    INDENT = "  "
+    NEWLINE = "\n"
+
+    def __init__(self, output):
+        self._output = output
+        self._pieces = []
+        self._write = self._pieces.append
+        # Per open element: [name, indent, child_count, held_child]
+        self._stack = []
+        self._text = []
+        self._cdata = None
+
+        parser = xml.parsers.expat.ParserCreate()
+        parser.buffer_text = True
+        parser.ordered_attributes = True
+        parser.StartElementHandler = self._start_element
+        parser.EndElementHandler = self._end_element
+        parser.CharacterDataHandler = self._character_data
+        parser.CommentHandler = self._comment
+        parser.ProcessingInstructionHandler = self._processing_instruction
+        parser.StartCdataSectionHandler = self._start_cdata
+        parser.EndCdataSectionHandler = self._end_cdata
+        # Same protections as defusedxml: no entity declarations or external
+        # references
+        parser.EntityDeclHandler = self._forbid_entity
+        parser.UnparsedEntityDeclHandler = self._forbid_unparsed_entity
+        parser.ExternalEntityRefHandler = self._forbid_external_reference
+        self._parser = parser
+
+    def feed(self, source):
+        """Format everything read from a binary file object."""
+        self._write('<?xml version="1.0" encoding="ascii"?>' + self.NEWLINE)
+        while chunk := source.read(FORMAT_CHUNK_SIZE):
+            self._parser.Parse(chunk, False)
+            self._flush_output()
+        self._parser.Parse(b"", True)
+        self._flush_output()
+
+    def _flush_output(self):
+        data = "".join(self._pieces)
+        self._output.write(data.encode("ascii", "xmlcharrefreplace"))
+        self._pieces.clear()
+
+    def _write_node(self, node, indent):
+        kind, data = node
+        if kind == "text":
+            self._write(indent + _escape(data) + self.NEWLINE)
+        else:
+            # minidom writes CDATA sections without indentation
+            self._write(f"<![CDATA[{data}]]>")
+
+    def _add_text_node(self, node):
+        if not self._stack:
+            return
+        parent = self._stack[-1]
+        if parent[2] == 0:
+            # Possibly the only child; decide once the next event arrives
+            self._write(">")
+            parent[2] = 1
+            parent[3] = node
+            return
+        self._write_node(node, self._begin_child())
+
+    def _flush_text(self):
+        if not self._text:
+            return
+        data = "".join(self._text)
+        self._text.clear()
+        self._add_text_node(("text", data))
+
+    def _start_element(self, name, attributes):
+        self._flush_text()
+        indent = self._begin_child()
+        self._write(indent + "<" + name)
+        if attributes:
+            # Namespace declarations first, as minidom serializes them
+            pairs = list(zip(attributes[::2], attributes[1::2]))
+            pairs.sort(key=lambda pair: not pair[0].startswith("xmlns"))
+            self._write(
+                "".join(f' {key}="{_escape(value)}"' for key, value in pairs)
+            )
+        self._stack.append([name, indent, 0, None])
+
+    def _end_element(self, name):
+        self._flush_text()
+        _, indent, child_count, held_child = self._stack.pop()
+        if child_count == 0:
+            self._write("/>" + self.NEWLINE)
+        elif held_child is not None:
+            # A lone text child stays inline: <w:t>text</w:t>
+            kind, data = held_child
+            self._write(_escape(data) if kind == "text" else f"<![CDATA[{data}]]>")
+            self._write(f"</{name}>" + self.NEWLINE)
+        else:
+            self._write(f"{indent}</{name}>" + self.NEWLINE)
+
+    def _begin_child(self):
+        """Start a new child of the current element and return its indent."""
+        if not self._stack:
+            return ""
+        parent = self._stack[-1]
+        _, indent, child_count, held_child = parent
+        if child_count == 0:
+            self._write(">" + self.NEWLINE)
+        elif held_child is not None:
+            # The held text was not the only child: put it on its own line
+            self._write(self.NEWLINE)
+            self._write_node(held_child, indent + self.INDENT)
+            parent[3] = None
+        parent[2] += 1
+        return indent + self.INDENT
+
+    def _character_data(self, data):
+        if self._cdata is not None:
+            self._cdata.append(data)
+        else:
+            self._text.append(data)
+
+    def _comment(self, data):
+        self._flush_text()
+        self._write(f"{self._begin_child()}<!--{data}-->" + self.NEWLINE)
+
+    def _processing_instruction(self, target, data):
+        self._flush_text()
+        self._write(f"{self._begin_child()}<?{target} {data}?>" + self.NEWLINE)
+
+    def _start_cdata(self):
+        self._flush_text()
+        self._cdata = []
+
+    def _end_cdata(self):
+        self._add_text_node(("cdata", "".join(self._cdata)))
+        self._cdata = None
+
+    def _forbid_entity(
+        self, name, is_parameter_entity, value, base, sysid, pubid, notation_name
+    ):
+        raise EntitiesForbidden(name, value, base, sysid, pubid, notation_name)
+
+    def _forbid_unparsed_entity(self, name, base, sysid, pubid, notation_name):
+        raise EntitiesForbidden(name, None, base, sysid, pubid, notation_name)
+
+    def _forbid_external_reference(self, context, base, sysid, pubid):
+        raise ExternalReferenceForbidden(context, base, sysid, pubid)
+
+
+def _escape(data):
+    """Escape text or an attribute value the way minidom does."""
+    return (
+        data.replace("&", "&amp;")
+        .replace("<", "&lt;")
+        .replace('"', "&quot;")
+        .replace(">", "&gt;")
+    )
+
+
+if __name__ == "__main__":
+    main()
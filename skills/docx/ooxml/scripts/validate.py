@@ -3,14 +3,21 @@
 Command line tool to validate Office document XML files against XSD schemas and tracked changes.
 
 Usage:
-    python validate.py <dir> --original <original_file>
+    python validate.py <dir> --original <original_file> [--jobs N] [--timings]
+        [--author NAME ...]
 """
 
 import argparse
 import sys
 from pathlib import Path
 
-from validation import DOCXSchemaValidator, PPTXSchemaValidator, RedliningValidator
+from validation import (
+    BaseSchemaValidator,
+    DOCXSchemaValidator,
+    OriginalPackage,
+    PPTXSchemaValidator,
+    RedliningValidator,
+)
 
 
 def main():
@@ -30,6 +37,24 @@ def main():
         action="store_true",
         help="Enable verbose output",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for XSD validation (0 = one per CPU, default: 1)",
+    )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="Print the time spent in each validation check",
+    )
+    parser.add_argument(
+        "--author",
+        action="append",
+        dest="authors",
+        help="Author whose tracked changes to validate (repeatable, default: Claude)",
+    )
     args = parser.parse_args()
 
     # Validate paths
@@ -52,12 +77,26 @@ def main():
             print(f"Error: Validation not supported for file type {file_extension}")
             sys.exit(1)
 
-    # Run validators
+    # Run validators, sharing one view of the original file between them
     success = True
-    for V in validators:
-        validator = V(unpacked_dir, original_file, verbose=args.verbose)
-        if not validator.validate():
-            success = False
+    with OriginalPackage(original_file) as original_package:
+        for V in validators:
+            # Only the schema validators fan out over worker processes
+            if issubclass(V, BaseSchemaValidator):
+                extra = {"jobs": args.jobs}
+            else:
+                extra = {"authors": args.authors or ["Claude"]}
+            validator = V(
+                unpacked_dir,
+                original_file,
+                verbose=args.verbose,
+                original_package=original_package,
+                **extra,
+            )
+            if not validator.validate():
+                success = False
+            if args.timings and hasattr(validator, "print_timings"):
+                validator.print_timings()
 
     if success:
         print("All validations PASSED!")
@@ -3,13 +3,20 @@ Validation modules for Word document processing.
 """
 
 from .base import BaseSchemaValidator
+from .baseline import ValidationBaseline
+from .changes import TrackedChange, TrackedChangeIndex
 from .docx import DOCXSchemaValidator
+from .package import OriginalPackage
 from .pptx import PPTXSchemaValidator
 from .redlining import RedliningValidator
 
 __all__ = [
     "BaseSchemaValidator",
     "DOCXSchemaValidator",
+    "OriginalPackage",
     "PPTXSchemaValidator",
     "RedliningValidator",
+    "TrackedChange",
+    "TrackedChangeIndex",
+    "ValidationBaseline",
 ]
@@ -0,0 +1,47 @@
+"""
+Content hashes of the last successfully validated state, for incremental validation.
+"""
+
+import hashlib
+from pathlib import Path
+
+
+class ValidationBaseline:
+    """Snapshot of an unpacked document as of its last successful validation.
+
+    Holds a content hash for every part plus the per-part results that other
+    parts are checked against (global-scope IDs). A validator given a
+    baseline skips file-local checks for parts whose hash is unchanged, and
+    only re-runs cross-part checks when a .rels file, [Content_Types].xml or
+    the set of parts changed.
+
+    An empty baseline matches nothing, so the first validation is always full.
+
+    Attributes:
+        hashes: Part name -> content digest at the last successful validation
+        global_ids: Part name -> list of (id_value, line, tag) global-scope IDs
+    """
+
+    def __init__(self):
+        self.hashes = {}
+        self.global_ids = {}
+
+    @staticmethod
+    def hash_parts(unpacked_dir):
+        """Return a part name -> content digest mapping for every file in unpacked_dir."""
+        unpacked_dir = Path(unpacked_dir)
+        hashes = {}
+        for file_path in unpacked_dir.rglob("*"):
+            if file_path.is_file():
+                part_name = file_path.relative_to(unpacked_dir).as_posix()
+                hashes[part_name] = hashlib.sha1(file_path.read_bytes()).hexdigest()
+        return hashes
+
+    def update(self, validator):
+        """Record the state a validator just validated successfully."""
+        self.hashes = dict(validator.part_hashes)
+        self.global_ids = dict(validator.global_ids_by_part)
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -0,0 +1,316 @@
+"""
+Index of the tracked changes in a Word document, and word diffs of its text.
+"""
+
+import difflib
+from dataclasses import dataclass
+from typing import Optional
+
+import lxml.etree
+
+W_NAMESPACE = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+# Above this many characters, text is diffed word by word instead of
+# character by character
+CHARACTER_DIFF_LIMIT = 5000
+
+
+@dataclass
+class TrackedChange:
+    """A w:ins or w:del element of a document.xml."""
+
+    kind: str  # "ins" or "del"
+    id: str
+    author: str
+    date: str
+    paragraph: Optional[int]  # Innermost enclosing w:p, counting all w:p in order
+    offset: int  # Position in that paragraph's current text
+    text: str  # w:t text of an insertion, w:delText text of a deletion
+
+
+class TrackedChangeIndex:
+    """Tracked changes and paragraph text of a document.xml, read in one pass.
+
+    The index keeps every text run together with the tracked changes around
+    it, so the text with any set of authors' changes rejected can be derived
+    from the same index, without parsing the document again per author.
+
+    Attributes:
+        changes: Every TrackedChange in document order
+        by_author: Author -> list of their changes
+        by_date: Date -> list of changes made at that time
+        by_id: w:id -> list of changes with that ID
+    """
+
+    def __init__(self):
+        self.changes = []
+        self.by_author = {}
+        self.by_date = {}
+        self.by_id = {}
+        # One (context, segments) entry per w:p in document order. A context
+        # is the tuple of (kind, author) of the changes around an element; a
+        # segment is (text, is_deleted_text, context)
+        self._paragraphs = []
+
+    @classmethod
+    def parse(cls, source):
+        """Build the index of a document.xml with a single streaming parse.
+
+        Args:
+            source: Path or binary file object of the document.xml
+
+        Raises:
+            lxml.etree.XMLSyntaxError: If the document is not well-formed
+        """
+        index = cls()
+        index._read(source)
+        return index
+
+    @property
+    def authors(self):
+        """Set of the authors of all tracked changes."""
+        return set(self.by_author)
+
+    def changes_by(self, authors):
+        """Return the changes made by any of the given authors, in document order."""
+        authors = set(authors)
+        return [change for change in self.changes if change.author in authors]
+
+    def rejected_paragraphs(self, authors=()):
+        """Return the paragraph texts with the given authors' changes rejected.
+
+        Their insertions are left out and their deleted text is read as
+        regular text; other authors' changes stay as they are. Each
+        paragraph's text includes the text of paragraphs nested inside it
+        (e.g. in text boxes), and empty paragraphs are skipped to avoid false
+        positives when tracked insertions add only structural elements
+        without text content. With no authors, this is the current text.
+        """
+        return [text for text in self._paragraph_texts(authors) if text]
+
+    def summary(self, authors=None):
+        """Summarize the tracked changes of the given authors (default: all).
+
+        Returns:
+            dict: With keys
+                - "authors": author -> counts of insertions, deletions and
+                  inserted and deleted characters
+                - "spans": one dict per change (kind, id, author, date,
+                  paragraph, offset, text) in document order
+                - "paragraphs": one dict per paragraph the changes touch, with
+                  its text before and after them and a word diff of the two
+        """
+        authors = self.authors if authors is None else set(authors)
+        changes = self.changes_by(authors)
+
+        counts = {}
+        for change in changes:
+            author_counts = counts.setdefault(
+                change.author,
+                {
+                    "insertions": 0,
+                    "deletions": 0,
+                    "inserted_characters": 0,
+                    "deleted_characters": 0,
+                },
+            )
+            if change.kind == "ins":
+                author_counts["insertions"] += 1
+                author_counts["inserted_characters"] += len(change.text)
+            else:
+                author_counts["deletions"] += 1
+                author_counts["deleted_characters"] += len(change.text)
+
+        touched = sorted(
+            {change.paragraph for change in changes if change.paragraph is not None}
+        )
+        before = self._paragraph_texts(authors)
+        after = self._paragraph_texts(())
+        paragraphs = []
+        for i in touched:
+            old, new = before[i] or "", after[i] or ""
+            paragraphs.append(
+                {"paragraph": i, "before": old, "after": new, "diff": word_diff(old, new)}
+            )
+
+        return {
+            "authors": counts,
+            "spans": [
+                {
+                    "kind": change.kind,
+                    "id": change.id,
+                    "author": change.author,
+                    "date": change.date,
+                    "paragraph": change.paragraph,
+                    "offset": change.offset,
+                    "text": change.text,
+                }
+                for change in changes
+            ],
+            "paragraphs": paragraphs,
+        }
+
+    def _paragraph_texts(self, authors):
+        """Return the text of every w:p with the given authors' changes rejected.
+
+        Paragraphs inside a rejected insertion are None.
+        """
+        authors = set(authors)
+        # Contexts are shared between segments, so each is evaluated once
+        states = {}
+
+        def state(context):
+            key = id(context)
+            if key not in states:
+                states[key] = (
+                    any(k == "ins" and a in authors for k, a in context),
+                    any(k == "del" and a in authors for k, a in context),
+                )
+            return states[key]
+
+        texts = []
+        for context, segments in self._paragraphs:
+            if state(context)[0]:
+                texts.append(None)
+                continue
+            parts = []
+            for text, deleted, segment_context in segments:
+                in_insertion, in_deletion = state(segment_context)
+                if not in_insertion and (not deleted or in_deletion):
+                    parts.append(text)
+            texts.append("".join(parts))
+        return texts
+
+    def _read(self, source):
+        p_tag = f"{{{W_NAMESPACE}}}p"
+        t_tag = f"{{{W_NAMESPACE}}}t"
+        deltext_tag = f"{{{W_NAMESPACE}}}delText"
+        change_tags = {f"{{{W_NAMESPACE}}}ins": "ins", f"{{{W_NAMESPACE}}}del": "del"}
+        id_attr = f"{{{W_NAMESPACE}}}id"
+        author_attr = f"{{{W_NAMESPACE}}}author"
+        date_attr = f"{{{W_NAMESPACE}}}date"
+
+        context = ()
+        open_changes = []  # (change, text parts)
+        open_paragraphs = []  # [paragraph index, segments, current text length]
+
+        for event, elem in lxml.etree.iterparse(
+            source,
+            events=("start", "end"),
+            tag=[p_tag, t_tag, deltext_tag, *change_tags],
+            resolve_entities=False,
+            no_network=True,
+        ):
+            tag = elem.tag
+            kind = change_tags.get(tag)
+            if event == "start":
+                if kind is not None:
+                    author = elem.get(author_attr, "")
+                    change = TrackedChange(
+                        kind=kind,
+                        id=elem.get(id_attr, ""),
+                        author=author,
+                        date=elem.get(date_attr, ""),
+                        paragraph=open_paragraphs[-1][0] if open_paragraphs else None,
+                        offset=open_paragraphs[-1][2] if open_paragraphs else 0,
+                        text="",
+                    )
+                    self._add(change)
+                    open_changes.append((change, []))
+                    context = context + ((kind, author),)
+                elif tag == p_tag:
+                    segments = []
+                    self._paragraphs.append((context, segments))
+                    open_paragraphs.append([len(self._paragraphs) - 1, segments, 0])
+                continue
+
+            if tag == t_tag or tag == deltext_tag:
+                text = elem.text
+                if text:
+                    deleted = tag == deltext_tag
+                    segment = (text, deleted, context)
+                    for paragraph in open_paragraphs:
+                        paragraph[1].append(segment)
+                        if not deleted:
+                            paragraph[2] += len(text)
+                    wanted = "del" if deleted else "ins"
+                    for change, parts in open_changes:
+                        if change.kind == wanted:
+                            parts.append(text)
+            elif kind is not None:
+                change, parts = open_changes.pop()
+                change.text = "".join(parts)
+                context = context[:-1]
+            elif tag == p_tag:
+                open_paragraphs.pop()
+
+            # Drop everything already read, keeping memory flat
+            elem.clear(keep_tail=False)
+            parent = elem.getparent()
+            if parent is not None:
+                while elem.getprevious() is not None:
+                    del parent[0]
+
+    def _add(self, change):
+        self.changes.append(change)
+        self.by_author.setdefault(change.author, []).append(change)
+        self.by_date.setdefault(change.date, []).append(change)
+        self.by_id.setdefault(change.id, []).append(change)
+
+
+def word_diff(original, modified):
+    """Return modified with inline [-removed-] and {+added+} markers.
+
+    Diffs character by character, or word by word for long text.
+    """
+    if len(original) + len(modified) > CHARACTER_DIFF_LIMIT:
+        original_tokens = original.split(" ")
+        modified_tokens = modified.split(" ")
+        separator = " "
+    else:
+        original_tokens = list(original)
+        modified_tokens = list(modified)
+        separator = ""
+
+    parts = []
+    matcher = difflib.SequenceMatcher(
+        None, original_tokens, modified_tokens, autojunk=False
+    )
+    for op, i1, i2, j1, j2 in matcher.get_opcodes():
+        if op == "equal":
+            parts.append(separator.join(modified_tokens[j1:j2]))
+            continue
+        if i1 < i2:
+            parts.append(f"[-{separator.join(original_tokens[i1:i2])}-]")
+        if j1 < j2:
+            parts.append(f"{{+{separator.join(modified_tokens[j1:j2])}+}}")
+    return separator.join(parts)
+
+
+def diff_paragraphs(original_paragraphs, modified_paragraphs):
+    """Return word-diff lines for the paragraphs that differ.
+
+    Paragraphs are aligned by their hashes first, so only the mismatching
+    ones are diffed character by character, one line per changed paragraph.
+    """
+    lines = []
+    matcher = difflib.SequenceMatcher(
+        None, original_paragraphs, modified_paragraphs, autojunk=False
+    )
+    for op, i1, i2, j1, j2 in matcher.get_opcodes():
+        if op == "equal":
+            continue
+        # Pair up the paragraphs edited in place, the rest were removed or added
+        pairs = min(i2 - i1, j2 - j1)
+        for original, modified in zip(
+            original_paragraphs[i1 : i1 + pairs],
+            modified_paragraphs[j1 : j1 + pairs],
+        ):
+            lines.append(word_diff(original, modified))
+        lines.extend(f"[-{text}-]" for text in original_paragraphs[i1 + pairs : i2])
+        lines.extend(f"{{+{text}+}}" for text in modified_paragraphs[j1 + pairs : j2])
+    return lines
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -28,48 +28,48 @@ class PPTXSchemaValidator(BaseSchemaValidator):
     def validate(self):
         """Run all validation checks and return True if all pass."""
         # Test 0: XML well-formedness
-        if not self.validate_xml():
+        if not self._run_check(self.validate_xml):
             return False
 
         # Test 1: Namespace declarations
         all_valid = True
-        if not self.validate_namespaces():
+        if not self._run_check(self.validate_namespaces):
             all_valid = False
 
         # Test 2: Unique IDs
-        if not self.validate_unique_ids():
+        if not self._run_check(self.validate_unique_ids):
             all_valid = False
 
         # Test 3: UUID ID validation
-        if not self.validate_uuid_ids():
+        if not self._run_check(self.validate_uuid_ids):
             all_valid = False
 
         # Test 4: Relationship and file reference validation
-        if not self.validate_file_references():
+        if not self._run_check(self.validate_file_references):
             all_valid = False
 
         # Test 5: Slide layout ID validation
-        if not self.validate_slide_layout_ids():
+        if not self._run_check(self.validate_slide_layout_ids):
             all_valid = False
 
         # Test 6: Content type declarations
-        if not self.validate_content_types():
+        if not self._run_check(self.validate_content_types):
             all_valid = False
 
         # Test 7: XSD schema validation
-        if not self.validate_against_xsd():
+        if not self._run_check(self.validate_against_xsd):
             all_valid = False
 
         # Test 8: Notes slide reference validation
-        if not self.validate_notes_slide_references():
+        if not self._run_check(self.validate_notes_slide_references):
             all_valid = False
 
         # Test 9: Relationship ID reference validation
-        if not self.validate_all_relationship_ids():
+        if not self._run_check(self.validate_all_relationship_ids):
             all_valid = False
 
         # Test 10: Duplicate slide layout references validation
-        if not self.validate_no_duplicate_slide_layouts():
+        if not self._run_check(self.validate_no_duplicate_slide_layouts):
             all_valid = False
 
         return all_valid
@@ -86,7 +86,7 @@ class PPTXSchemaValidator(BaseSchemaValidator):
 
         for xml_file in self.xml_files:
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
+                root = self._parse_xml(xml_file).getroot()
 
                 # Check all elements for ID attributes
                 for elem in root.iter():
@@ -142,7 +142,7 @@ class PPTXSchemaValidator(BaseSchemaValidator):
         for slide_master in slide_masters:
             try:
                 # Parse the slide master file
-                root = lxml.etree.parse(str(slide_master)).getroot()
+                root = self._parse_xml(slide_master).getroot()
 
                 # Find the corresponding _rels file for this slide master
                 rels_file = slide_master.parent / "_rels" / f"{slide_master.name}.rels"
@@ -155,7 +155,7 @@ class PPTXSchemaValidator(BaseSchemaValidator):
                     continue
 
                 # Parse the relationships file
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
+                rels_root = self._parse_xml(rels_file).getroot()
 
                 # Build a set of valid relationship IDs that point to slide layouts
                 valid_layout_rids = set()
@@ -202,14 +202,12 @@ class PPTXSchemaValidator(BaseSchemaValidator):
 
     def validate_no_duplicate_slide_layouts(self):
         """Validate that each slide has exactly one slideLayout reference."""
-        import lxml.etree
-
         errors = []
         slide_rels_files = list(self.unpacked_dir.glob("ppt/slides/_rels/*.xml.rels"))
 
         for rels_file in slide_rels_files:
             try:
-                root = lxml.etree.parse(str(rels_file)).getroot()
+                root = self._parse_xml(rels_file).getroot()
 
                 # Find all slideLayout relationships
                 layout_rels = [
@@ -258,7 +256,7 @@ class PPTXSchemaValidator(BaseSchemaValidator):
         for rels_file in slide_rels_files:
             try:
                 # Parse the relationships file
-                root = lxml.etree.parse(str(rels_file)).getroot()
+                root = self._parse_xml(rels_file).getroot()
 
                 # Find all notesSlide relationships
                 for rel in root.findall(
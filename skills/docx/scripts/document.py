@@ -8,6 +8,9 @@ Usage:
     # Initialize
     doc = Document('workspace/unpacked')
     doc = Document('workspace/unpacked', author="John Doe", initials="JD")
+    doc = Document('workspace/unpacked', backend="lxml")  # Faster on large documents
+    doc = Document('workspace/unpacked', copy_on_write=True)  # Only copies touched parts
+    doc = Document('workspace/unpacked', author="Reviewer 2", other_authors=["Reviewer 1"])
 
     # Find nodes
     node = doc["word/document.xml"].get_node(tag="w:del", attrs={"w:id": "1"})
@@ -22,27 +25,45 @@ Usage:
     doc["word/document.xml"].revert_insertion(ins_node)  # Reject insertion
     doc["word/document.xml"].revert_deletion(del_node)  # Reject deletion
 
+    # Summarize tracked changes (counts, spans and per-paragraph diffs)
+    summary = doc.change_summary()
+
     # Save
     doc.save()
 """
 
+import copy
 import html
+import io
+import os
 import random
 import shutil
 import tempfile
 from datetime import datetime, timezone
 from pathlib import Path
 
+import lxml.etree
 from defusedxml import minidom
-from ooxml.scripts.pack import pack_document
+from ooxml.scripts.validation.baseline import ValidationBaseline
+from ooxml.scripts.validation.changes import TrackedChangeIndex
 from ooxml.scripts.validation.docx import DOCXSchemaValidator
+from ooxml.scripts.validation.package import OriginalPackage
 from ooxml.scripts.validation.redlining import RedliningValidator
 
-from .utilities import XMLEditor
+from .utilities import XML_NAMESPACE, LxmlXMLEditor, XMLEditor
 
 # Path to template files
 TEMPLATE_DIR = Path(__file__).parent / "templates"
 
+# Editor implementations Document can use for word/document.xml
+EDITOR_BACKENDS = ("minidom", "lxml")
+
+# Tracked change IDs (see XMLEditor._id_sources)
+CHANGE_ID_SOURCE = (("w:ins", "w:del"), "w:id", "", 0)
+
+# Editing methods apply_edits() can call with just the element
+DOCX_ELEMENT_OPERATIONS = ("suggest_deletion", "revert_insertion", "revert_deletion")
+
 
 class DocxXMLEditor(XMLEditor):
     """XMLEditor that automatically applies RSID, author, and date to new elements.
@@ -56,6 +77,9 @@ class DocxXMLEditor(XMLEditor):
         dom (defusedxml.minidom.Document): The DOM document for direct manipulation
     """
 
+    _id_sources = {**XMLEditor._id_sources, "change": CHANGE_ID_SOURCE}
+    _element_operations = DOCX_ELEMENT_OPERATIONS
+
     def __init__(
         self, xml_path, rsid: str, author: str = "Claude", initials: str = "C"
     ):
@@ -73,18 +97,8 @@ class DocxXMLEditor(XMLEditor):
         self.initials = initials
 
     def _get_next_change_id(self):
-        """Get the next available change ID by checking all tracked change elements."""
-        max_id = -1
-        for tag in ("w:ins", "w:del"):
-            elements = self.dom.getElementsByTagName(tag)
-            for elem in elements:
-                change_id = elem.getAttribute("w:id")
-                if change_id:
-                    try:
-                        max_id = max(max_id, int(change_id))
-                    except ValueError:
-                        pass
-        return max_id + 1
+        """Allocate a tracked change ID above those of all w:ins and w:del elements."""
+        return self._allocate_id("change")
 
     def _ensure_w16du_namespace(self):
         """Ensure w16du namespace is declared on the root element."""
@@ -204,62 +218,28 @@ class DocxXMLEditor(XMLEditor):
                     if not elem.hasAttribute("xml:space"):
                         elem.setAttribute("xml:space", "preserve")
 
+        handlers = {
+            "w:p": add_rsid_to_p,
+            "w:r": add_rsid_to_r,
+            "w:t": add_xml_space_to_t,
+            "w:ins": add_tracked_change_attrs,
+            "w:del": add_tracked_change_attrs,
+            "w:comment": add_comment_attrs,
+            "w16cex:commentExtensible": add_comment_extensible_date,
+        }
         for node in nodes:
             if node.nodeType != node.ELEMENT_NODE:
                 continue
 
-            # Handle the node itself
-            if node.tagName == "w:p":
-                add_rsid_to_p(node)
-            elif node.tagName == "w:r":
-                add_rsid_to_r(node)
-            elif node.tagName == "w:t":
-                add_xml_space_to_t(node)
-            elif node.tagName in ("w:ins", "w:del"):
-                add_tracked_change_attrs(node)
-            elif node.tagName == "w:comment":
-                add_comment_attrs(node)
-            elif node.tagName == "w16cex:commentExtensible":
-                add_comment_extensible_date(node)
-
-            # Process descendants (getElementsByTagName doesn't return the element itself)
-            for elem in node.getElementsByTagName("w:p"):
-                add_rsid_to_p(elem)
-            for elem in node.getElementsByTagName("w:r"):
-                add_rsid_to_r(elem)
-            for elem in node.getElementsByTagName("w:t"):
-                add_xml_space_to_t(elem)
-            for tag in ("w:ins", "w:del"):
-                for elem in node.getElementsByTagName(tag):
-                    add_tracked_change_attrs(elem)
-            for elem in node.getElementsByTagName("w:comment"):
-                add_comment_attrs(elem)
-            for elem in node.getElementsByTagName("w16cex:commentExtensible"):
-                add_comment_extensible_date(elem)
-
-    def replace_node(self, elem, new_content):
-        """Replace node with automatic attribute injection."""
-        nodes = super().replace_node(elem, new_content)
-        self._inject_attributes_to_nodes(nodes)
-        return nodes
-
-    def insert_after(self, elem, xml_content):
-        """Insert after with automatic attribute injection."""
-        nodes = super().insert_after(elem, xml_content)
-        self._inject_attributes_to_nodes(nodes)
-        return nodes
-
-    def insert_before(self, elem, xml_content):
-        """Insert before with automatic attribute injection."""
-        nodes = super().insert_before(elem, xml_content)
-        self._inject_attributes_to_nodes(nodes)
-        return nodes
+            # One walk over the node and its descendants
+            for elem in self._iter_elements(node):
+                handler = handlers.get(elem.tagName)
+                if handler is not None:
+                    handler(elem)
 
-    def append_to(self, elem, xml_content):
-        """Append to with automatic attribute injection."""
-        nodes = super().append_to(elem, xml_content)
+    def _after_insert(self, nodes):
+        """Inject attributes into nodes inserted by the editing methods."""
         self._inject_attributes_to_nodes(nodes)
-        return nodes
 
     def revert_insertion(self, elem):
         """Reject an insertion by wrapping its content in a deletion.
@@ -337,6 +317,9 @@ class DocxXMLEditor(XMLEditor):
             # Inject attributes to the deletion wrapper
             self._inject_attributes_to_nodes([del_wrapper])
 
+        # Runs were rewritten in place
+        self.invalidate(elem)
+
         return [elem]
 
     def revert_deletion(self, elem):
@@ -528,6 +511,7 @@ class DocxXMLEditor(XMLEditor):
 
             # Inject attributes to the deletion wrapper
             self._inject_attributes_to_nodes([del_wrapper])
+            self.invalidate(del_wrapper)
 
             return del_wrapper
 
@@ -586,6 +570,7 @@ class DocxXMLEditor(XMLEditor):
 
             # Inject attributes to the deletion wrapper
             self._inject_attributes_to_nodes([del_wrapper])
+            self.invalidate(elem)
 
             return elem
 
@@ -593,6 +578,348 @@ class DocxXMLEditor(XMLEditor):
             raise ValueError(f"Element must be w:r or w:p, got {elem.nodeName}")
 
 
+# Namespaces of the attributes LxmlDocxXMLEditor sets on new elements
+NAMESPACES = {
+    "w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main",
+    "w14": "http://schemas.microsoft.com/office/word/2010/wordml",
+    "w16du": "http://schemas.microsoft.com/office/word/2023/wordml/word16du",
+    "w16cex": "http://schemas.microsoft.com/office/word/2018/wordml/cex",
+    "xml": XML_NAMESPACE,
+}
+
+
+def _qn(name: str) -> str:
+    """Convert a prefixed name such as "w:p" to lxml's Clark notation."""
+    prefix, local = name.split(":")
+    return f"{{{NAMESPACES[prefix]}}}{local}"
+
+
+class LxmlDocxXMLEditor(LxmlXMLEditor):
+    """DocxXMLEditor backed by lxml, for large documents.
+
+    Same methods and automatic attributes as DocxXMLEditor, but nodes are
+    lxml.etree elements (see LxmlXMLEditor). Use it directly, or pass
+    backend="lxml" to Document to edit word/document.xml with it.
+
+    Attributes:
+        tree (lxml.etree._ElementTree): The parsed tree for direct manipulation
+        root (lxml.etree._Element): Its root element
+    """
+
+    _id_sources = {**LxmlXMLEditor._id_sources, "change": CHANGE_ID_SOURCE}
+    _element_operations = DOCX_ELEMENT_OPERATIONS
+
+    suggest_paragraph = staticmethod(DocxXMLEditor.suggest_paragraph)
+
+    def __init__(
+        self, xml_path, rsid: str, author: str = "Claude", initials: str = "C"
+    ):
+        """Initialize with required RSID and optional author.
+
+        Args:
+            xml_path: Path to XML file to edit
+            rsid: RSID to automatically apply to new elements
+            author: Author name for tracked changes and comments (default: "Claude")
+            initials: Author initials (default: "C")
+        """
+        super().__init__(xml_path)
+        self.rsid = rsid
+        self.author = author
+        self.initials = initials
+
+    def _get_next_change_id(self):
+        """Allocate a tracked change ID above those of all w:ins and w:del elements."""
+        return self._allocate_id("change")
+
+    def _set_namespaced(self, elem, prefix, name, value):
+        """Set a prefixed attribute, declaring its namespace on the root if needed."""
+        uri = NAMESPACES[prefix]
+        elem.set(f"{{{uri}}}{name}", value)
+        if uri not in self.root.nsmap.values():
+            # lxml declared the namespace locally; move it to the root under
+            # its usual prefix, keeping every other declaration
+            prefixes = {p for e in self.root.iter(lxml.etree.Element) for p in e.nsmap}
+            prefixes.discard(None)
+            lxml.etree.cleanup_namespaces(
+                self.tree, top_nsmap={prefix: uri}, keep_ns_prefixes=sorted(prefixes)
+            )
+            self._names.clear()
+
+    def _inject_attributes_to_nodes(self, nodes):
+        """Inject RSID, author, and date attributes into nodes where applicable.
+
+        Applies the same attributes as DocxXMLEditor._inject_attributes_to_nodes.
+
+        Args:
+            nodes: List of lxml nodes to process
+        """
+        timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        w_del = _qn("w:del")
+
+        def set_default(elem, name, value):
+            if elem.get(_qn(name)) is None:
+                elem.set(_qn(name), value)
+
+        def is_inside_deletion(elem):
+            """Check if element is inside a w:del element."""
+            parent = elem.getparent()
+            while parent is not None:
+                if parent.tag == w_del:
+                    return True
+                parent = parent.getparent()
+            return False
+
+        def add_rsid_to_p(elem):
+            set_default(elem, "w:rsidR", self.rsid)
+            set_default(elem, "w:rsidRDefault", self.rsid)
+            set_default(elem, "w:rsidP", self.rsid)
+            # Add w14:paraId and w14:textId if not present
+            if elem.get(_qn("w14:paraId")) is None:
+                self._set_namespaced(elem, "w14", "paraId", _generate_hex_id())
+            if elem.get(_qn("w14:textId")) is None:
+                self._set_namespaced(elem, "w14", "textId", _generate_hex_id())
+
+        def add_rsid_to_r(elem):
+            # Use w:rsidDel for <w:r> inside <w:del>, otherwise w:rsidR
+            if is_inside_deletion(elem):
+                set_default(elem, "w:rsidDel", self.rsid)
+            else:
+                set_default(elem, "w:rsidR", self.rsid)
+
+        def add_tracked_change_attrs(elem):
+            # Auto-assign w:id if not present
+            if elem.get(_qn("w:id")) is None:
+                elem.set(_qn("w:id"), str(self._get_next_change_id()))
+            set_default(elem, "w:author", self.author)
+            set_default(elem, "w:date", timestamp)
+            # Add w16du:dateUtc for tracked changes (same as w:date since we generate UTC timestamps)
+            if elem.get(_qn("w16du:dateUtc")) is None:
+                self._set_namespaced(elem, "w16du", "dateUtc", timestamp)
+
+        def add_comment_attrs(elem):
+            set_default(elem, "w:author", self.author)
+            set_default(elem, "w:date", timestamp)
+            set_default(elem, "w:initials", self.initials)
+
+        def add_comment_extensible_date(elem):
+            # Add w16cex:dateUtc for comment extensible elements
+            if elem.get(_qn("w16cex:dateUtc")) is None:
+                self._set_namespaced(elem, "w16cex", "dateUtc", timestamp)
+
+        def add_xml_space_to_t(elem):
+            # Add xml:space="preserve" to w:t if text has leading/trailing whitespace
+            text = elem.text
+            if text and (text[0].isspace() or text[-1].isspace()):
+                set_default(elem, "xml:space", "preserve")
+
+        handlers = {
+            _qn("w:p"): add_rsid_to_p,
+            _qn("w:r"): add_rsid_to_r,
+            _qn("w:t"): add_xml_space_to_t,
+            _qn("w:ins"): add_tracked_change_attrs,
+            w_del: add_tracked_change_attrs,
+            _qn("w:comment"): add_comment_attrs,
+            _qn("w16cex:commentExtensible"): add_comment_extensible_date,
+        }
+        for node in nodes:
+            if not isinstance(node.tag, str):
+                continue
+
+            # One walk over the node and its descendants
+            for elem in list(node.iter(*handlers)):
+                handlers[elem.tag](elem)
+
+    def _after_insert(self, nodes):
+        """Inject attributes into nodes inserted by the editing methods."""
+        self._inject_attributes_to_nodes(nodes)
+
+    def _new_element(self, parent, tag):
+        """Create an element in parent's namespace scope, appended to parent."""
+        return lxml.etree.SubElement(parent, _qn(tag))
+
+    def _mark_run_deleted(self, run):
+        """Convert w:t to w:delText and w:rsidR to w:rsidDel in a run."""
+        rsid_r, rsid_del = _qn("w:rsidR"), _qn("w:rsidDel")
+        for t_elem in run.iter(_qn("w:t")):
+            # Renaming keeps the text and attributes like xml:space
+            t_elem.tag = _qn("w:delText")
+        if run.get(rsid_r) is not None:
+            run.set(rsid_del, run.get(rsid_r))
+            del run.attrib[rsid_r]
+        elif run.get(rsid_del) is None:
+            run.set(rsid_del, self.rsid)
+
+    def revert_insertion(self, elem):
+        """Reject an insertion by wrapping its content in a deletion.
+
+        See DocxXMLEditor.revert_insertion.
+
+        Args:
+            elem: Element to process (w:ins, w:p, w:body, etc.)
+
+        Returns:
+            list: List containing the processed element(s)
+
+        Raises:
+            ValueError: If the element contains no w:ins elements
+        """
+        w_ins = _qn("w:ins")
+        if elem.tag == w_ins:
+            ins_elements = [elem]
+        else:
+            ins_elements = list(elem.iter(w_ins))
+
+        if not ins_elements:
+            raise ValueError(
+                f"revert_insertion requires w:ins elements. "
+                f"The provided element <{self.tag_name(elem)}> contains no insertions. "
+            )
+
+        for ins_elem in ins_elements:
+            runs = list(ins_elem.iter(_qn("w:r")))
+            if not runs:
+                continue
+
+            for run in runs:
+                self._mark_run_deleted(run)
+
+            # Move all children from ins into a del wrapper appended to it
+            children = list(ins_elem)
+            del_wrapper = self._new_element(ins_elem, "w:del")
+            for child in children:
+                del_wrapper.append(child)
+
+            self._inject_attributes_to_nodes([del_wrapper])
+
+        # Runs were rewritten in place
+        self.invalidate(elem)
+
+        return [elem]
+
+    def revert_deletion(self, elem):
+        """Reject a deletion by re-inserting the deleted content.
+
+        See DocxXMLEditor.revert_deletion.
+
+        Args:
+            elem: Element to process (w:del, w:p, w:body, etc.)
+
+        Returns:
+            list: If elem is w:del, returns [elem, new_ins]. Otherwise returns [elem].
+
+        Raises:
+            ValueError: If the element contains no w:del elements
+        """
+        w_del = _qn("w:del")
+        is_single_del = elem.tag == w_del
+        if is_single_del:
+            del_elements = [elem]
+        else:
+            del_elements = list(elem.iter(w_del))
+
+        if not del_elements:
+            raise ValueError(
+                f"revert_deletion requires w:del elements. "
+                f"The provided element <{self.tag_name(elem)}> contains no deletions. "
+            )
+
+        created_insertion = None
+        rsid_r, rsid_del = _qn("w:rsidR"), _qn("w:rsidDel")
+
+        for del_elem in del_elements:
+            runs = list(del_elem.iter(_qn("w:r")))
+            if not runs:
+                continue
+
+            ins_elem = lxml.etree.Element(_qn("w:ins"), nsmap=self.root.nsmap)
+            for run in runs:
+                new_run = copy.deepcopy(run)
+                new_run.tail = None
+                for del_text in new_run.iter(_qn("w:delText")):
+                    del_text.tag = _qn("w:t")
+                if new_run.get(rsid_del) is not None:
+                    new_run.set(rsid_r, new_run.get(rsid_del))
+                    del new_run.attrib[rsid_del]
+                elif new_run.get(rsid_r) is None:
+                    new_run.set(rsid_r, self.rsid)
+                ins_elem.append(new_run)
+
+            nodes = self.insert_after(
+                del_elem, lxml.etree.tostring(ins_elem, encoding="unicode")
+            )
+            if is_single_del and nodes:
+                created_insertion = nodes[0]
+
+        if is_single_del and created_insertion is not None:
+            return [elem, created_insertion]
+        else:
+            return [elem]
+
+    def suggest_deletion(self, elem):
+        """Mark a w:r or w:p element as deleted with tracked changes (in-place).
+
+        See DocxXMLEditor.suggest_deletion.
+
+        Args:
+            elem: A w:r or w:p element without existing tracked changes
+
+        Returns:
+            Element: The modified element
+
+        Raises:
+            ValueError: If element has existing tracked changes or invalid structure
+        """
+        if elem.tag == _qn("w:r"):
+            if next(elem.iter(_qn("w:delText")), None) is not None:
+                raise ValueError("w:r element already contains w:delText")
+
+            self._mark_run_deleted(elem)
+
+            # Wrap in w:del, leaving the text after the run outside it
+            del_wrapper = self._new_element(elem.getparent(), "w:del")
+            elem.addprevious(del_wrapper)
+            del_wrapper.tail, elem.tail = elem.tail, None
+            del_wrapper.append(elem)
+
+            self._inject_attributes_to_nodes([del_wrapper])
+            self.invalidate(del_wrapper)
+
+            return del_wrapper
+
+        elif elem.tag == _qn("w:p"):
+            if next(elem.iter(_qn("w:ins"), _qn("w:del")), None) is not None:
+                raise ValueError("w:p element already contains tracked changes")
+
+            pPr = next(elem.iter(_qn("w:pPr")), None)
+            is_numbered = (
+                pPr is not None and next(pPr.iter(_qn("w:numPr")), None) is not None
+            )
+
+            if is_numbered:
+                # Add <w:del/> marker first in w:rPr of w:pPr
+                rPr = next(pPr.iter(_qn("w:rPr")), None)
+                if rPr is None:
+                    rPr = self._new_element(pPr, "w:rPr")
+                rPr.insert(0, self._new_element(rPr, "w:del"))
+
+            for run in list(elem.iter(_qn("w:r"))):
+                self._mark_run_deleted(run)
+
+            # Wrap all non-pPr children in <w:del>
+            children = [c for c in elem if c.tag != _qn("w:pPr")]
+            del_wrapper = self._new_element(elem, "w:del")
+            for child in children:
+                del_wrapper.append(child)
+
+            self._inject_attributes_to_nodes([del_wrapper])
+            self.invalidate(elem)
+
+            return elem
+
+        else:
+            raise ValueError(f"Element must be w:r or w:p, got {self.tag_name(elem)}")
+
+
 def _generate_hex_id() -> str:
     """Generate random 8-character hex ID for para/durable IDs.
 
@@ -609,6 +936,15 @@ def _generate_rsid() -> str:
     return "".join(random.choices("0123456789ABCDEF", k=8))
 
 
+def _link_or_copy(source, destination):
+    """copytree() copy function that hard-links files, copying them as a fallback."""
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copy2(source, destination)
+    return destination
+
+
 class Document:
     """Manages comments in unpacked Word documents."""
 
@@ -619,6 +955,9 @@ class Document:
         track_revisions=False,
         author="Claude",
         initials="C",
+        backend="minidom",
+        copy_on_write=False,
+        other_authors=(),
     ):
         """
         Initialize with path to unpacked Word document directory.
@@ -630,20 +969,45 @@ class Document:
             track_revisions: If True, enables track revisions in settings.xml (default: False)
             author: Default author name for comments (default: "Claude")
             initials: Default author initials for comments (default: "C")
+            backend: "minidom" (default) or "lxml". With "lxml", word/document.xml
+                is edited with LxmlDocxXMLEditor, which is much faster on large
+                documents; its nodes are lxml elements instead of minidom nodes.
+            copy_on_write: If True, unpacked_path starts empty and only holds the
+                parts opened for editing (copied from the original on first
+                access) and files added to it; everything else is read from the
+                original directory, and save() writes back just those parts. Use
+                it for documents with large embedded media.
+            other_authors: Authors of earlier review passes over the same working
+                copy. Validation treats their tracked changes like author's,
+                checking all of them against the original in one pass.
         """
+        if backend not in EDITOR_BACKENDS:
+            raise ValueError(
+                f"Unknown backend: {backend}. Expected one of {EDITOR_BACKENDS}"
+            )
+        self.backend = backend
         self.original_path = Path(unpacked_dir)
 
         if not self.original_path.exists() or not self.original_path.is_dir():
             raise ValueError(f"Directory not found: {unpacked_dir}")
 
-        # Create temporary directory with subdirectories for unpacked content and baseline
+        # Create temporary directory for the unpacked content: a full copy, or
+        # an overlay of the touched parts in copy-on-write mode
+        self.copy_on_write = copy_on_write
         self.temp_dir = tempfile.mkdtemp(prefix="docx_")
         self.unpacked_path = Path(self.temp_dir) / "unpacked"
-        shutil.copytree(self.original_path, self.unpacked_path)
+        if copy_on_write:
+            self.unpacked_path.mkdir()
+        else:
+            shutil.copytree(self.original_path, self.unpacked_path)
+
+        # View of the original directory that validation compares against,
+        # created on first use (see original_package)
+        self._original_package = None
 
-        # Pack original directory into temporary .docx for validation baseline (outside unpacked dir)
-        self.original_docx = Path(self.temp_dir) / "original.docx"
-        pack_document(self.original_path, self.original_docx, validate=False)
+        # Part hashes of the last successful validation, so repeated saves
+        # only re-check the parts that changed in between
+        self._validation_baseline = ValidationBaseline()
 
         self.word_path = self.unpacked_path / "word"
 
@@ -655,6 +1019,9 @@ class Document:
         self.author = author
         self.initials = initials
 
+        # Authors whose tracked changes this session validates
+        self.session_authors = tuple(dict.fromkeys([author, *other_authors]))
+
         # Cache for lazy-loaded editors
         self._editors = {}
 
@@ -681,6 +1048,8 @@ class Document:
         """
         Get or create a DocxXMLEditor for the specified XML file.
 
+        With backend="lxml", word/document.xml gets an LxmlDocxXMLEditor.
+
         Enables lazy-loaded editors with bracket notation:
             node = doc["word/document.xml"].get_node(tag="w:p", line_number=42)
 
@@ -702,10 +1071,14 @@ class Document:
         """
         if xml_path not in self._editors:
             file_path = self.unpacked_path / xml_path
+            self._copy_part(file_path)
             if not file_path.exists():
                 raise ValueError(f"XML file not found: {xml_path}")
             # Use DocxXMLEditor with RSID, author, and initials for all editors
-            self._editors[xml_path] = DocxXMLEditor(
+            editor_class = DocxXMLEditor
+            if self.backend == "lxml" and xml_path == "word/document.xml":
+                editor_class = LxmlDocxXMLEditor
+            self._editors[xml_path] = editor_class(
                 file_path, rsid=self.rsid, author=self.author, initials=self.initials
             )
         return self._editors[xml_path]
@@ -737,7 +1110,7 @@ class Document:
 
         # If end node is a paragraph, append comment markup inside it
         # Otherwise insert after it (for run-level anchors)
-        if end.tagName == "w:p":
+        if self._document.tag_name(end) == "w:p":
             self._document.append_to(end, self._comment_range_end_xml(comment_id))
         else:
             self._document.insert_after(end, self._comment_range_end_xml(comment_id))
@@ -800,7 +1173,7 @@ class Document:
         self._document.insert_after(
             parent_start_elem, self._comment_range_start_xml(comment_id)
         )
-        parent_ref_run = parent_ref_elem.parentNode
+        parent_ref_run = self._document.get_parent(parent_ref_elem)
         self._document.insert_after(
             parent_ref_run, f'<w:commentRangeEnd w:id="{comment_id}"/>'
         )
@@ -830,8 +1203,84 @@ class Document:
         self.next_comment_id += 1
         return comment_id
 
+    def apply_edits(self, edits):
+        """
+        Apply a batch of edits to word/document.xml.
+
+        Resolves every locator first, parses all XML fragments in one parse and
+        injects RSID/author/date attributes in one pass at the end, which is
+        much faster than the single-edit methods for large redlines. See
+        XMLEditor.apply_edits for the details.
+
+        Args:
+            edits: List of (locator, operation, xml) tuples. The locator is an
+                element or a dict of get_node() arguments; the operation is
+                "replace_node", "insert_after", "insert_before", "append_to",
+                "suggest_deletion", "revert_insertion" or "revert_deletion"
+                (the last three take xml=None).
+
+        Returns:
+            list: What the editing method returned, for each edit
+
+        Example:
+            doc.apply_edits([
+                ({"tag": "w:r", "contains": "monthly"}, "replace_node",
+                 '<w:del><w:r><w:delText>monthly</w:delText></w:r></w:del>'
+                 '<w:ins><w:r><w:t>quarterly</w:t></w:r></w:ins>'),
+                ({"tag": "w:p", "contains": "Obsolete clause"}, "suggest_deletion", None),
+            ])
+        """
+        return self._document.apply_edits(edits)
+
+    def change_index(self) -> TrackedChangeIndex:
+        """
+        Index the tracked changes in word/document.xml as it is now.
+
+        The index groups the changes by author, date and ID and can give the
+        text with any set of authors' changes rejected, all from one parse of
+        the current (unsaved) document.
+
+        Returns:
+            TrackedChangeIndex of word/document.xml
+        """
+        return TrackedChangeIndex.parse(io.BytesIO(self._document.serialize()))
+
+    def change_summary(self, authors=None) -> dict:
+        """
+        Summarize the tracked changes in word/document.xml.
+
+        Args:
+            authors: Authors whose changes to summarize (default: the session's
+                author and other_authors)
+
+        Returns:
+            dict: Per-author counts, one span per change and a word diff of each
+                paragraph the changes touch; see TrackedChangeIndex.summary
+
+        Example:
+            summary = doc.change_summary()
+            for paragraph in summary["paragraphs"]:
+                print(paragraph["diff"])
+        """
+        if authors is None:
+            authors = self.session_authors
+        return self.change_index().summary(authors)
+
+    @property
+    def original_package(self):
+        """Shared, lazily-read view of the original directory for validation.
+
+        Parts are only read when a validator asks for them, and those about to
+        be overwritten are read just before save() writes back over them.
+        """
+        if self._original_package is None:
+            self._original_package = OriginalPackage(self.original_path)
+        return self._original_package
+
     def __del__(self):
         """Clean up temporary directory on deletion."""
+        if getattr(self, "_original_package", None) is not None:
+            self._original_package.close()
         if hasattr(self, "temp_dir") and Path(self.temp_dir).exists():
             shutil.rmtree(self.temp_dir)
 
@@ -839,22 +1288,39 @@ class Document:
         """
         Validate the document against XSD schema and redlining rules.
 
+        Validation is incremental: parts unchanged since the last successful
+        validation skip their file-local checks.
+
         Raises:
             ValueError: If validation fails.
         """
         # Create validators with current state
+        unpacked_dir = self._merged_tree()
         schema_validator = DOCXSchemaValidator(
-            self.unpacked_path, self.original_docx, verbose=False
-        )
-        redlining_validator = RedliningValidator(
-            self.unpacked_path, self.original_docx, verbose=False
+            unpacked_dir,
+            self.original_path,
+            verbose=False,
+            original_package=self.original_package,
+            baseline=self._validation_baseline,
         )
 
         # Run validations
         if not schema_validator.validate():
             raise ValueError("Schema validation failed")
-        if not redlining_validator.validate():
-            raise ValueError("Redlining validation failed")
+
+        # Redlining only looks at word/document.xml
+        if not schema_validator.is_unchanged("word/document.xml"):
+            redlining_validator = RedliningValidator(
+                unpacked_dir,
+                self.original_path,
+                verbose=False,
+                original_package=self.original_package,
+                authors=self.session_authors,
+            )
+            if not redlining_validator.validate():
+                raise ValueError("Redlining validation failed")
+
+        self._validation_baseline.update(schema_validator)
 
     def save(self, destination=None, validate=True) -> None:
         """
@@ -867,7 +1333,7 @@ class Document:
             validate: If True, validates document before saving (default: True).
         """
         # Only ensure comment relationships and content types if comment files exist
-        if self.comments_path.exists():
+        if self._part_exists(self.comments_path):
             self._ensure_comment_relationships()
             self._ensure_comment_content_types()
 
@@ -881,13 +1347,91 @@ class Document:
 
         # Copy contents from temp directory to destination (or original directory)
         target_path = Path(destination) if destination else self.original_path
+        if target_path.resolve() == self.original_path.resolve():
+            # Keep the XML parts about to be overwritten for later validations
+            self.original_package.preload(
+                name
+                for name in self._overlay_parts()
+                if name.endswith((".xml", ".rels"))
+            )
+        elif self.copy_on_write:
+            # Parts nobody touched come straight from the original
+            shutil.copytree(
+                self.original_path,
+                target_path,
+                ignore=self._ignore_overlay_parts,
+                dirs_exist_ok=True,
+            )
         shutil.copytree(self.unpacked_path, target_path, dirs_exist_ok=True)
 
+    # ==================== Private: Copy-on-write ====================
+
+    def _original_part(self, path):
+        """Return the original directory's counterpart of a path in unpacked_path."""
+        return self.original_path / Path(path).relative_to(self.unpacked_path)
+
+    def _part_exists(self, path):
+        """Check if a part exists, counting original parts not copied yet."""
+        if path.exists():
+            return True
+        return self.copy_on_write and self._original_part(path).is_file()
+
+    def _copy_part(self, path):
+        """In copy-on-write mode, copy a part from the original on first access."""
+        if not self.copy_on_write or path.exists():
+            return
+        source = self._original_part(path)
+        if source.is_file():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(source, path)
+
+    def _overlay_parts(self):
+        """Return the names of the parts in unpacked_path."""
+        return [
+            file_path.relative_to(self.unpacked_path).as_posix()
+            for file_path in self.unpacked_path.rglob("*")
+            if file_path.is_file()
+        ]
+
+    def _ignore_overlay_parts(self, directory, names):
+        """copytree() ignore callback skipping original files shadowed by the overlay."""
+        overlay_dir = self.unpacked_path / Path(directory).relative_to(
+            self.original_path
+        )
+        return [name for name in names if (overlay_dir / name).is_file()]
+
+    def _merged_tree(self):
+        """Return a directory with the complete current document, for validation.
+
+        That is unpacked_path itself unless in copy-on-write mode, where the
+        overlay and the untouched original parts are hard-linked into a fresh
+        directory (copied when linking is not possible, e.g. across devices).
+        """
+        if not self.copy_on_write:
+            return self.unpacked_path
+
+        merged_path = Path(self.temp_dir) / "merged"
+        if merged_path.exists():
+            shutil.rmtree(merged_path)
+        shutil.copytree(
+            self.original_path,
+            merged_path,
+            ignore=self._ignore_overlay_parts,
+            copy_function=_link_or_copy,
+        )
+        shutil.copytree(
+            self.unpacked_path,
+            merged_path,
+            copy_function=_link_or_copy,
+            dirs_exist_ok=True,
+        )
+        return merged_path
+
     # ==================== Private: Initialization ====================
 
     def _get_next_comment_id(self):
         """Get the next available comment ID."""
-        if not self.comments_path.exists():
+        if not self._part_exists(self.comments_path):
             return 0
 
         editor = self["word/comments.xml"]
@@ -903,7 +1447,7 @@ class Document:
 
     def _load_existing_comments(self):
         """Load existing comments from files to enable replies."""
-        if not self.comments_path.exists():
+        if not self._part_exists(self.comments_path):
             return {}
 
         editor = self["word/comments.xml"]
@@ -953,7 +1497,7 @@ class Document:
 
     def _update_people_xml(self, path):
         """Create people.xml if it doesn't exist."""
-        if not path.exists():
+        if not self._part_exists(path):
             # Copy from template
             shutil.copy(TEMPLATE_DIR / "people.xml", path)
 
@@ -1069,7 +1613,7 @@ class Document:
         self, comment_id, para_id, text, author, initials, timestamp
     ):
         """Add a single comment to comments.xml."""
-        if not self.comments_path.exists():
+        if not self._part_exists(self.comments_path):
             shutil.copy(TEMPLATE_DIR / "comments.xml", self.comments_path)
 
         editor = self["word/comments.xml"]
@@ -1090,7 +1634,7 @@ class Document:
 
     def _add_to_comments_extended_xml(self, para_id, parent_para_id):
         """Add a single comment to commentsExtended.xml."""
-        if not self.comments_extended_path.exists():
+        if not self._part_exists(self.comments_extended_path):
             shutil.copy(
                 TEMPLATE_DIR / "commentsExtended.xml", self.comments_extended_path
             )
@@ -1106,7 +1650,7 @@ class Document:
 
     def _add_to_comments_ids_xml(self, para_id, durable_id):
         """Add a single comment to commentsIds.xml."""
-        if not self.comments_ids_path.exists():
+        if not self._part_exists(self.comments_ids_path):
             shutil.copy(TEMPLATE_DIR / "commentsIds.xml", self.comments_ids_path)
 
         editor = self["word/commentsIds.xml"]
@@ -1117,7 +1661,7 @@ class Document:
 
     def _add_to_comments_extensible_xml(self, durable_id):
         """Add a single comment to commentsExtensible.xml."""
-        if not self.comments_extensible_path.exists():
+        if not self._part_exists(self.comments_extensible_path):
             shutil.copy(
                 TEMPLATE_DIR / "commentsExtensible.xml", self.comments_extensible_path
             )
@@ -1183,7 +1727,7 @@ class Document:
         people_path = self.word_path / "people.xml"
 
         # people.xml should already exist from _setup_tracking
-        if not people_path.exists():
+        if not self._part_exists(people_path):
             raise ValueError("people.xml should exist after _setup_tracking")
 
         editor = self["word/people.xml"]
@@ -28,14 +28,29 @@ Example usage:
 
     # Save changes
     editor.save()
+
+Lookups use indexes (by tag, by attribute value, by source line, and cached
+element text) that are built on first use and kept up to date by the editing
+methods. After changing editor.dom directly, call editor.invalidate(node).
+
+LxmlXMLEditor provides the same methods on an lxml tree (editor.tree,
+editor.root), which loads, edits and saves large files much faster.
 """
 
+import bisect
 import html
 from pathlib import Path
 from typing import Optional, Union
 
+import defusedxml
 import defusedxml.minidom
 import defusedxml.sax
+import lxml.etree
+
+XML_NAMESPACE = "http://www.w3.org/XML/1998/namespace"
+
+# Element wrapping each fragment when several are parsed together
+FRAGMENT_TAG = "fragment"
 
 
 class XMLEditor:
@@ -52,6 +67,15 @@ class XMLEditor:
         dom: Parsed DOM tree with parse_position attributes on elements
     """
 
+    # ID sequences handed out by _allocate_id():
+    # name -> (tags, ID attribute, ID prefix, first ID)
+    _id_sources = {"rId": (("Relationship",), "Id", "rId", 1)}
+
+    # Operations apply_edits() accepts: methods taking XML content, and
+    # methods taking only the element
+    _fragment_operations = ("replace_node", "insert_after", "insert_before", "append_to")
+    _element_operations = ()
+
     def __init__(self, xml_path):
         """
         Initialize with path to XML file and parse with line number tracking.
@@ -73,6 +97,14 @@ class XMLEditor:
         parser = _create_line_tracking_parser()
         self.dom = defusedxml.minidom.parse(str(self.xml_path), parser)
 
+        # Lookup indexes, built lazily and kept current by the editing methods
+        self._tag_index = None  # tag -> {element: None}
+        self._attr_index = {}  # (tag, attr) -> {value: {element: None}}
+        self._line_index = {}  # tag -> (sorted source lines, elements)
+        self._text_cache = {}  # element -> text from _get_element_text
+        self._pending = []  # Subtrees added or changed since the last lookup
+        self._id_allocators = {}  # name -> (_IdAllocator, tag keys, attribute)
+
     def get_node(
         self,
         tag: str,
@@ -109,12 +141,20 @@ class XMLEditor:
             elem = editor.get_node(tag="w:t", contains="&#8220;Agreement")  # Entity notation
             elem = editor.get_node(tag="w:t", contains="\u201cAgreement")   # Unicode character
         """
+        candidates = self._candidates(tag, attrs, line_number)
+        return self._select_node(candidates, tag, attrs, line_number, contains)
+
+    def _select_node(self, candidates, tag, attrs=None, line_number=None, contains=None):
+        """Return the one candidate passing get_node()'s filters, or raise ValueError."""
+        # Normalize the search string: convert HTML entities to Unicode characters
+        # This allows searching for both "&#8220;Rowan" and ""Rowan"
+        normalized_contains = html.unescape(contains) if contains is not None else None
+
         matches = []
-        for elem in self.dom.getElementsByTagName(tag):
+        for elem in candidates:
             # Check line_number filter
             if line_number is not None:
-                parse_pos = getattr(elem, "parse_position", (None,))
-                elem_line = parse_pos[0]
+                elem_line = self._source_line(elem)
 
                 # Handle both single line number and range
                 if isinstance(line_number, range):
@@ -127,7 +167,7 @@ class XMLEditor:
             # Check attrs filter
             if attrs is not None:
                 if not all(
-                    elem.getAttribute(attr_name) == attr_value
+                    self._get_attribute(elem, attr_name) == attr_value
                     for attr_name, attr_value in attrs.items()
                 ):
                     continue
@@ -135,12 +175,13 @@ class XMLEditor:
             # Check contains filter
             if contains is not None:
                 elem_text = self._get_element_text(elem)
-                # Normalize the search string: convert HTML entities to Unicode characters
-                # This allows searching for both "&#8220;Rowan" and ""Rowan"
-                normalized_contains = html.unescape(contains)
                 if normalized_contains not in elem_text:
                     continue
 
+            # Skip elements removed from the document since they were indexed
+            if not self._is_attached(elem):
+                continue
+
             # If all applicable filters passed, this is a match
             matches.append(elem)
 
@@ -180,12 +221,176 @@ class XMLEditor:
             )
         return matches[0]
 
+    def invalidate(self, node=None):
+        """
+        Refresh lookup indexes after the DOM was changed without the editor methods.
+
+        Args:
+            node: Root of the changed subtree, which must still be in the
+                document (its parent if it was removed). Default: drop all
+                indexes so they are rebuilt on the next lookup.
+        """
+        if node is None:
+            self._tag_index = None
+            self._attr_index = {}
+            self._text_cache = {}
+            self._pending = []
+            self._id_allocators = {}
+            return
+        for elem in self._iter_elements(node):
+            self._text_cache.pop(elem, None)
+        self._invalidate_text(node)
+        self._pending.append(node)
+        self._observe_ids(node)
+
+    def tag_name(self, elem):
+        """Return the qualified tag name of an element (e.g. "w:p")."""
+        return elem.tagName
+
+    def get_parent(self, node):
+        """Return the parent of a node, or None for a detached node."""
+        return node.parentNode
+
+    def _candidates(self, tag, attrs, line_number):
+        """Return the indexed elements that can match, a superset of the matches."""
+        self._update_indexes()
+        tag = self._tag_key(tag)
+        if attrs:
+            attr_name, attr_value = next(iter(attrs.items()))
+            return list(self._get_attr_index(tag, attr_name).get(attr_value, ()))
+        if line_number is not None:
+            lines, elements = self._get_line_index(tag)
+            if isinstance(line_number, range):
+                if line_number.step < 0:
+                    return list(self._tag_index.get(tag, ()))
+                start, stop = line_number.start, line_number.stop
+            else:
+                start, stop = line_number, line_number + 1
+            return elements[
+                bisect.bisect_left(lines, start) : bisect.bisect_left(lines, stop)
+            ]
+        return list(self._tag_index.get(tag, ()))
+
+    def _update_indexes(self):
+        """Build the tag index on first use and add pending subtrees to all indexes."""
+        if self._tag_index is None:
+            self._tag_index = {}
+            self._attr_index = {}
+            self._pending = []
+            root = self._root_element()
+            if root is not None:
+                self._index_subtree(root)
+            return
+        pending, self._pending = self._pending, []
+        for node in pending:
+            if self._is_attached(node):
+                self._index_subtree(node)
+
+    def _index_subtree(self, node):
+        for elem in self._iter_elements(node):
+            tag = self._element_key(elem)
+            self._tag_index.setdefault(tag, {})[elem] = None
+            for (indexed_tag, attr_name), by_value in self._attr_index.items():
+                if indexed_tag == tag:
+                    value = self._get_attribute(elem, attr_name)
+                    by_value.setdefault(value, {})[elem] = None
+
+    def _unindex_subtree(self, node):
+        """Drop a subtree that is being removed from the document."""
+        if self._tag_index is None:
+            return
+        for elem in self._iter_elements(node):
+            tag = self._element_key(elem)
+            self._tag_index.get(tag, {}).pop(elem, None)
+            self._text_cache.pop(elem, None)
+            for (indexed_tag, attr_name), by_value in self._attr_index.items():
+                if indexed_tag == tag:
+                    value = self._get_attribute(elem, attr_name)
+                    by_value.get(value, {}).pop(elem, None)
+
+    def _get_attr_index(self, tag, attr_name):
+        key = (tag, attr_name)
+        if key not in self._attr_index:
+            by_value = {}
+            for elem in self._tag_index.get(tag, ()):
+                value = self._get_attribute(elem, attr_name)
+                by_value.setdefault(value, {})[elem] = None
+            self._attr_index[key] = by_value
+        return self._attr_index[key]
+
+    def _get_line_index(self, tag):
+        # Only parsed elements have source lines, and they never change, so
+        # this index is built once; removed elements are filtered on lookup
+        if tag not in self._line_index:
+            positioned = sorted(
+                (
+                    (line, index, elem)
+                    for index, elem in enumerate(self._tag_index.get(tag, ()))
+                    if (line := self._source_line(elem)) is not None
+                ),
+                key=lambda item: item[:2],
+            )
+            self._line_index[tag] = (
+                [line for line, _, _ in positioned],
+                [elem for _, _, elem in positioned],
+            )
+        return self._line_index[tag]
+
+    def _track_inserted(self, nodes):
+        """Queue inserted nodes for indexing and invalidate their ancestors' text."""
+        for node in nodes:
+            if self._is_element(node):
+                self._pending.append(node)
+                self._observe_ids(node)
+        if nodes:
+            self._invalidate_text(self.get_parent(nodes[0]))
+
+    def _invalidate_text(self, node):
+        while node is not None:
+            self._text_cache.pop(node, None)
+            node = self.get_parent(node)
+
+    def _is_attached(self, node):
+        while node is not None:
+            if node is self.dom:
+                return True
+            node = node.parentNode
+        return False
+
+    # Tree access used by the lookup indexes; LxmlXMLEditor overrides these
+
+    def _root_element(self):
+        return self.dom.documentElement
+
+    def _tag_key(self, tag):
+        """Map a get_node() tag to the key elements are indexed under."""
+        return tag
+
+    def _element_key(self, elem):
+        return elem.tagName
+
+    def _get_attribute(self, elem, attr_name):
+        """Return an attribute value, or "" if the element does not have it."""
+        return elem.getAttribute(attr_name)
+
+    def _source_line(self, elem):
+        """Return the element's line in the original file, None if it was inserted."""
+        return getattr(elem, "parse_position", (None,))[0]
+
+    def _is_element(self, node):
+        return node.nodeType == node.ELEMENT_NODE
+
+    def _iter_elements(self, node):
+        return _iter_elements(node)
+
     def _get_element_text(self, elem):
         """
         Recursively extract all text content from an element.
 
         Skips text nodes that contain only whitespace (spaces, tabs, newlines),
         which typically represent XML formatting rather than document content.
+        Results are cached per element until the element or a descendant is
+        edited.
 
         Args:
             elem: defusedxml.minidom.Element to extract text from
@@ -193,6 +398,9 @@ class XMLEditor:
         Returns:
             str: Concatenated text from all non-whitespace text nodes within the element
         """
+        text = self._text_cache.get(elem)
+        if text is not None:
+            return text
         text_parts = []
         for node in elem.childNodes:
             if node.nodeType == node.TEXT_NODE:
@@ -201,7 +409,9 @@ class XMLEditor:
                     text_parts.append(node.data)
             elif node.nodeType == node.ELEMENT_NODE:
                 text_parts.append(self._get_element_text(node))
-        return "".join(text_parts)
+        text = "".join(text_parts)
+        self._text_cache[elem] = text
+        return text
 
     def replace_node(self, elem, new_content):
         """
@@ -217,12 +427,7 @@ class XMLEditor:
         Example:
             new_nodes = editor.replace_node(old_elem, "<w:r><w:t>text</w:t></w:r>")
         """
-        parent = elem.parentNode
-        nodes = self._parse_fragment(new_content)
-        for node in nodes:
-            parent.insertBefore(node, elem)
-        parent.removeChild(elem)
-        return nodes
+        return self._edit(elem, "replace_node", new_content)
 
     def insert_after(self, elem, xml_content):
         """
@@ -238,15 +443,7 @@ class XMLEditor:
         Example:
             new_nodes = editor.insert_after(elem, "<w:r><w:t>text</w:t></w:r>")
         """
-        parent = elem.parentNode
-        next_sibling = elem.nextSibling
-        nodes = self._parse_fragment(xml_content)
-        for node in nodes:
-            if next_sibling:
-                parent.insertBefore(node, next_sibling)
-            else:
-                parent.appendChild(node)
-        return nodes
+        return self._edit(elem, "insert_after", xml_content)
 
     def insert_before(self, elem, xml_content):
         """
@@ -262,11 +459,7 @@ class XMLEditor:
         Example:
             new_nodes = editor.insert_before(elem, "<w:r><w:t>text</w:t></w:r>")
         """
-        parent = elem.parentNode
-        nodes = self._parse_fragment(xml_content)
-        for node in nodes:
-            parent.insertBefore(node, elem)
-        return nodes
+        return self._edit(elem, "insert_before", xml_content)
 
     def append_to(self, elem, xml_content):
         """
@@ -282,22 +475,210 @@ class XMLEditor:
         Example:
             new_nodes = editor.append_to(elem, "<w:r><w:t>text</w:t></w:r>")
         """
-        nodes = self._parse_fragment(xml_content)
-        for node in nodes:
-            elem.appendChild(node)
+        return self._edit(elem, "append_to", xml_content)
+
+    def apply_edits(self, edits):
+        """
+        Apply a batch of edits with one round of lookups and one fragment parse.
+
+        All locators are resolved before anything changes, so line numbers and
+        text refer to the document as it was before the batch. The edits are
+        then applied in order; if one raises, the edits before it stay applied.
+
+        Args:
+            edits: List of (locator, operation, xml) tuples. The locator is an
+                element or a dict of get_node() arguments. The operation names
+                an editing method: "replace_node", "insert_after",
+                "insert_before" or "append_to", which take XML content, or on
+                docx editors "suggest_deletion", "revert_insertion" and
+                "revert_deletion", which take None.
+
+        Returns:
+            list: What the editing method returned, for each edit
+
+        Raises:
+            ValueError: If a locator does not match exactly one node, an
+                operation is unknown, XML content is not well-formed, or an
+                edit targets a node that another edit in the batch replaces
+
+        Example:
+            editor.apply_edits([
+                ({"tag": "w:r", "contains": "monthly"}, "replace_node", "<w:r>...</w:r>"),
+                ({"tag": "w:p", "line_number": 42}, "suggest_deletion", None),
+            ])
+        """
+        edits = [tuple(edit) for edit in edits]
+        for index, (_, operation, xml_content) in enumerate(edits):
+            if operation in self._fragment_operations:
+                if xml_content is None:
+                    raise ValueError(f"Edit {index}: {operation} requires XML content")
+            elif operation in self._element_operations:
+                if xml_content is not None:
+                    raise ValueError(f"Edit {index}: {operation} takes no XML content")
+            else:
+                raise ValueError(f"Edit {index}: unknown operation {operation!r}")
+
+        targets = self._resolve_locators([locator for locator, _, _ in edits])
+        self._check_batch_targets(edits, targets)
+
+        fragment_edits = [
+            (index, xml_content)
+            for index, (_, operation, xml_content) in enumerate(edits)
+            if operation in self._fragment_operations
+        ]
+        try:
+            fragments = iter(self._parse_fragments([xml for _, xml in fragment_edits]))
+        except Exception:
+            # Name the edit whose fragment does not parse on its own
+            for index, xml_content in fragment_edits:
+                try:
+                    self._parse_fragments([xml_content])
+                except Exception as e:
+                    raise ValueError(f"Edit {index}: invalid XML content: {e}") from e
+            raise
+        results = []
+        inserted = []
+        for target, (_, operation, _) in zip(targets, edits):
+            if operation in self._fragment_operations:
+                nodes = next(fragments)
+                self._insert_nodes(target, operation, nodes)
+                inserted.extend(nodes)
+                results.append(nodes)
+            else:
+                results.append(getattr(self, operation)(target))
+        # One pass over everything the batch inserted
+        self._after_insert(inserted)
+        return results
+
+    def _resolve_locators(self, locators):
+        """
+        Resolve apply_edits() locators against the current indexes.
+
+        Text lookups share one string per tag joining the text of all its
+        elements, so each is a single str.find scan instead of a loop over
+        every element.
+        """
+        text_indexes = {}
+        targets = []
+        for index, locator in enumerate(locators):
+            if not isinstance(locator, dict):
+                targets.append(locator)
+                continue
+            try:
+                contains = locator.get("contains")
+                if contains is None or locator.get("attrs"):
+                    targets.append(self.get_node(**locator))
+                    continue
+                tag = locator["tag"]
+                if tag not in text_indexes:
+                    text_indexes[tag] = self._build_text_index(tag)
+                candidates = _find_in_text_index(
+                    text_indexes[tag], html.unescape(contains)
+                )
+                targets.append(self._select_node(candidates, **locator))
+            except ValueError as e:
+                raise ValueError(f"Edit {index}: {e}") from None
+        return targets
+
+    def _build_text_index(self, tag):
+        """Join the text of every element of a tag, for _find_in_text_index()."""
+        self._update_indexes()
+        elements = list(self._tag_index.get(self._tag_key(tag), ()))
+        starts = []
+        offset = 0
+        texts = []
+        for elem in elements:
+            text = self._get_element_text(elem)
+            starts.append(offset)
+            texts.append(text)
+            offset += len(text) + 1
+        # NUL cannot occur in XML text, so matches never span two elements
+        return elements, starts, "\0".join(texts)
+
+    def _edit(self, elem, operation, xml_content):
+        nodes = self._parse_fragments([xml_content])[0]
+        self._insert_nodes(elem, operation, nodes)
+        self._after_insert(nodes)
         return nodes
 
+    def _insert_nodes(self, elem, operation, nodes):
+        """Place parsed nodes as a fragment operation on elem describes."""
+        if operation == "append_to":
+            for node in nodes:
+                elem.appendChild(node)
+        else:
+            parent = elem.parentNode
+            anchor = elem.nextSibling if operation == "insert_after" else elem
+            for node in nodes:
+                parent.insertBefore(node, anchor)
+            if operation == "replace_node":
+                self._unindex_subtree(elem)
+                parent.removeChild(elem)
+        self._track_inserted(nodes)
+
+    def _after_insert(self, nodes):
+        """Hook for subclasses to process nodes inserted by the editing methods."""
+
+    def _check_batch_targets(self, edits, targets):
+        """Reject edits whose target is inside a node replaced by another edit."""
+        replaced = {}
+        for index, (target, (_, operation, _)) in enumerate(zip(targets, edits)):
+            if operation == "replace_node":
+                if target in replaced:
+                    raise ValueError(
+                        f"Edits {replaced[target]} and {index} both replace the same node"
+                    )
+                replaced[target] = index
+        if not replaced:
+            return
+        for index, target in enumerate(targets):
+            node = target
+            while node is not None:
+                if node in replaced and replaced[node] != index:
+                    raise ValueError(
+                        f"Edit {index} targets a node that edit {replaced[node]} replaces"
+                    )
+                node = self.get_parent(node)
+
     def get_next_rid(self):
-        """Get the next available rId for relationships files."""
-        max_id = 0
-        for rel_elem in self.dom.getElementsByTagName("Relationship"):
-            rel_id = rel_elem.getAttribute("Id")
-            if rel_id.startswith("rId"):
-                try:
-                    max_id = max(max_id, int(rel_id[3:]))
-                except ValueError:
-                    pass
-        return f"rId{max_id + 1}"
+        """
+        Get the next available rId for relationships files.
+
+        Each call returns a new rId, above every rId in the file and in
+        Relationship elements inserted since.
+        """
+        return f"rId{self._allocate_id('rId')}"
+
+    def _allocate_id(self, name):
+        """
+        Allocate the next ID of a sequence declared in _id_sources.
+
+        The first allocation scans the tag index for the highest existing ID;
+        later ones are O(1), with IDs in inserted or invalidated content
+        recorded by _observe_ids().
+        """
+        if name not in self._id_allocators:
+            tags, attr_name, prefix, start = self._id_sources[name]
+            tag_keys = {self._tag_key(tag) for tag in tags}
+            allocator = _IdAllocator(prefix, start)
+            self._update_indexes()
+            for tag_key in tag_keys:
+                # Removed elements may still be listed; skipping past their
+                # IDs is harmless
+                for elem in self._tag_index.get(tag_key, ()):
+                    allocator.observe(self._get_attribute(elem, attr_name))
+            self._id_allocators[name] = (allocator, tag_keys, attr_name)
+        return self._id_allocators[name][0].allocate()
+
+    def _observe_ids(self, node):
+        """Record the IDs in a subtree with the allocators already in use."""
+        if not self._id_allocators:
+            return
+        for elem in self._iter_elements(node):
+            tag = self._element_key(elem)
+            for allocator, tag_keys, attr_name in self._id_allocators.values():
+                if tag in tag_keys:
+                    allocator.observe(self._get_attribute(elem, attr_name))
 
     def save(self):
         """
@@ -306,21 +687,44 @@ class XMLEditor:
         Serializes the DOM tree and writes it back to the original file path,
         preserving the original encoding (ascii or utf-8).
         """
-        content = self.dom.toxml(encoding=self.encoding)
-        self.xml_path.write_bytes(content)
+        self.xml_path.write_bytes(self.serialize())
 
-    def _parse_fragment(self, xml_content):
+    def serialize(self):
         """
-        Parse XML fragment and return list of imported nodes.
+        Return the edited XML as bytes, exactly as save() would write it.
+        """
+        return self.dom.toxml(encoding=self.encoding)
+
+    def _parse_fragments(self, contents):
+        """
+        Parse XML fragments with a single parse and return the nodes of each.
 
         Args:
-            xml_content: String containing XML fragment
+            contents: List of strings containing XML fragments
 
         Returns:
-            List of defusedxml.minidom.Node objects imported into this document
+            List with the list of nodes of each fragment, ready to insert
 
         Raises:
-            AssertionError: If fragment contains no element nodes
+            AssertionError: If a fragment contains no element nodes
+        """
+        body = "".join(f"<{FRAGMENT_TAG}>{content}</{FRAGMENT_TAG}>" for content in contents)
+        groups = self._parse_wrapped(body)
+        for nodes in groups:
+            elements = [n for n in nodes if self._is_element(n)]
+            assert elements, "Fragment must contain at least one element"
+        return groups
+
+    def _parse_wrapped(self, body):
+        """
+        Parse FRAGMENT_TAG elements in a root declaring the document's namespaces.
+
+        Args:
+            body: String of FRAGMENT_TAG elements wrapping the fragments
+
+        Returns:
+            List with the child nodes of each FRAGMENT_TAG element, imported
+            into this document
         """
         # Extract namespace declarations from the root document element
         root_elem = self.dom.documentElement
@@ -332,15 +736,288 @@ class XMLEditor:
                     namespaces.append(f'{attr.name}="{attr.value}"')  # type: ignore
 
         ns_decl = " ".join(namespaces)
-        wrapper = f"<root {ns_decl}>{xml_content}</root>"
+        wrapper = f"<root {ns_decl}>{body}</root>"
         fragment_doc = defusedxml.minidom.parseString(wrapper)
-        nodes = [
-            self.dom.importNode(child, deep=True)
-            for child in fragment_doc.documentElement.childNodes  # type: ignore
+        return [
+            [self.dom.importNode(child, deep=True) for child in container.childNodes]
+            for container in fragment_doc.documentElement.childNodes  # type: ignore
         ]
-        elements = [n for n in nodes if n.nodeType == n.ELEMENT_NODE]
-        assert elements, "Fragment must contain at least one element"
-        return nodes
+
+
+class LxmlXMLEditor(XMLEditor):
+    """
+    XMLEditor backed by an lxml tree instead of minidom.
+
+    Offers the same lookup and editing methods as XMLEditor, but nodes are
+    lxml.etree elements and get_node() line numbers come from their
+    sourceline. Loading, serializing and subtree edits run in libxml2, which
+    makes this editor much faster on large parts such as word/document.xml.
+
+    Text between elements is stored on lxml elements as .text/.tail rather
+    than as separate nodes, so the editing methods return only the inserted
+    elements (and comments), not the whitespace between them.
+
+    Attributes:
+        xml_path: Path to the XML file being edited
+        encoding: Detected encoding of the XML file ('ascii' or 'utf-8')
+        tree: Parsed lxml.etree._ElementTree
+        root: Root element of the tree
+    """
+
+    def __init__(self, xml_path):
+        """
+        Initialize with path to XML file and parse it with lxml.
+
+        Args:
+            xml_path: Path to XML file to edit (str or Path)
+
+        Raises:
+            ValueError: If the XML file does not exist
+            defusedxml.EntitiesForbidden: If the document declares entities
+        """
+        self.xml_path = Path(xml_path)
+        if not self.xml_path.exists():
+            raise ValueError(f"XML file not found: {xml_path}")
+
+        with open(self.xml_path, "rb") as f:
+            header = f.read(200).decode("utf-8", errors="ignore")
+        self.encoding = "ascii" if 'encoding="ascii"' in header else "utf-8"
+
+        self._parser = _create_safe_lxml_parser()
+        self.tree = lxml.etree.parse(str(self.xml_path), self._parser)
+        _forbid_entity_declarations(self.tree)
+        self.root = self.tree.getroot()
+
+        self._tag_index = None
+        self._attr_index = {}
+        self._line_index = {}
+        self._text_cache = {}
+        self._pending = []
+        self._id_allocators = {}
+        self._names = {}  # "prefix:name" -> Clark notation
+
+    def tag_name(self, elem):
+        """Return the qualified tag name of an element (e.g. "w:p")."""
+        local = lxml.etree.QName(elem).localname
+        return f"{elem.prefix}:{local}" if elem.prefix else local
+
+    def get_parent(self, node):
+        """Return the parent of a node, or None for a detached node."""
+        return node.getparent()
+
+    def qualified_name(self, name, attribute=False):
+        """
+        Convert a prefixed name to lxml's Clark notation using the root's namespaces.
+
+        Args:
+            name: Prefixed name (e.g. "w:p", "xml:space", "Relationship")
+            attribute: Unprefixed attribute names are not in the default namespace
+
+        Returns:
+            str: Name in Clark notation (e.g. "{http://...}p"), or the name
+            unchanged if its prefix is not declared on the root element
+        """
+        key = (name, attribute)
+        if key not in self._names:
+            prefix, _, local = name.rpartition(":")
+            if prefix == "xml":
+                uri = XML_NAMESPACE
+            elif prefix or not attribute:
+                uri = self.root.nsmap.get(prefix or None)
+            else:
+                uri = None
+            self._names[key] = f"{{{uri}}}{local}" if uri else name
+        return self._names[key]
+
+    def _root_element(self):
+        return self.root
+
+    def _tag_key(self, tag):
+        return self.qualified_name(tag)
+
+    def _element_key(self, elem):
+        return elem.tag
+
+    def _get_attribute(self, elem, attr_name):
+        return elem.get(self.qualified_name(attr_name, attribute=True), "")
+
+    def _source_line(self, elem):
+        return elem.sourceline
+
+    def _is_element(self, node):
+        return isinstance(node.tag, str)
+
+    def _iter_elements(self, node):
+        return node.iter(lxml.etree.Element)
+
+    def _is_attached(self, node):
+        while node is not None:
+            if node is self.root:
+                return True
+            node = node.getparent()
+        return False
+
+    def _get_element_text(self, elem):
+        """
+        Recursively extract all text content from an element.
+
+        Skips whitespace-only text, which typically represents XML formatting
+        rather than document content, and the text of comments and processing
+        instructions. Results are cached per element until it is edited.
+
+        Args:
+            elem: lxml.etree element to extract text from
+
+        Returns:
+            str: Concatenated non-whitespace text within the element
+        """
+        text = self._text_cache.get(elem)
+        if text is not None:
+            return text
+        text_parts = []
+        if elem.text and elem.text.strip():
+            text_parts.append(elem.text)
+        for child in elem:
+            if isinstance(child.tag, str):
+                text_parts.append(self._get_element_text(child))
+            if child.tail and child.tail.strip():
+                text_parts.append(child.tail)
+        text = "".join(text_parts)
+        self._text_cache[elem] = text
+        return text
+
+    def _insert_nodes(self, elem, operation, nodes):
+        if operation == "append_to":
+            for node in nodes:
+                elem.append(node)
+        elif operation == "insert_before":
+            for node in nodes:
+                elem.addprevious(node)
+        else:
+            # Insert directly after elem, before the text that follows it
+            tail, elem.tail = elem.tail, None
+            anchor = elem
+            for node in nodes:
+                anchor.addnext(node)
+                anchor = node
+            anchor.tail = (anchor.tail or "") + (tail or "") or None
+            if operation == "replace_node":
+                self._unindex_subtree(elem)
+                elem.getparent().remove(elem)
+        self._track_inserted(nodes)
+
+    def save(self):
+        """
+        Save the edited XML back to the file.
+
+        Serializes the tree and writes it back to the original file path,
+        preserving the original encoding (ascii or utf-8) and standalone flag.
+        """
+        self.xml_path.write_bytes(self.serialize())
+
+    def serialize(self):
+        """
+        Return the edited XML as bytes, exactly as save() would write it.
+        """
+        docinfo = self.tree.docinfo
+        declaration = f'<?xml version="{docinfo.xml_version or "1.0"}" encoding="{self.encoding}"'
+        # lxml reports a missing standalone flag as False, like standalone="no"
+        if docinfo.standalone:
+            declaration += ' standalone="yes"'
+        content = lxml.etree.tostring(
+            self.tree, encoding=self.encoding, xml_declaration=False
+        )
+        return declaration.encode("ascii") + b"?>\n" + content
+
+    def _parse_wrapped(self, body):
+        ns_decl = " ".join(
+            f'xmlns:{prefix}="{uri}"' if prefix else f'xmlns="{uri}"'
+            for prefix, uri in self.root.nsmap.items()
+        )
+        wrapper = f"<root {ns_decl}>{body}</root>"
+        fragment = lxml.etree.fromstring(wrapper.encode("utf-8"), self._parser)
+        # Only parsed elements have lines in the original file
+        for node in fragment.iter():
+            node.sourceline = 0
+        return [list(container) for container in fragment]
+
+
+def _create_safe_lxml_parser():
+    """
+    Create an lxml parser with the protections defusedxml gives minidom.
+
+    Entities are never expanded and neither DTDs nor network resources are
+    loaded; _forbid_entity_declarations() rejects documents declaring entities.
+
+    Returns:
+        lxml.etree.XMLParser: Configured parser
+    """
+    return lxml.etree.XMLParser(
+        resolve_entities=False,
+        load_dtd=False,
+        no_network=True,
+        huge_tree=False,
+        remove_blank_text=False,
+    )
+
+
+def _forbid_entity_declarations(tree):
+    """Raise EntitiesForbidden if the document's DTD declares any entity."""
+    dtd = tree.docinfo.internalDTD
+    if dtd is None:
+        return
+    for entity in dtd.iterentities():
+        raise defusedxml.EntitiesForbidden(
+            entity.name, entity.content, None, entity.system_url, None, None
+        )
+
+
+def _find_in_text_index(text_index, text):
+    """Return the elements of a text index whose text contains text."""
+    elements, starts, joined = text_index
+    found = []
+    position = joined.find(text)
+    while position != -1:
+        i = bisect.bisect_right(starts, position) - 1
+        found.append(elements[i])
+        if i + 1 == len(starts):
+            break
+        position = joined.find(text, starts[i + 1])
+    return found
+
+
+class _IdAllocator:
+    """Hands out integer IDs above every ID observed so far."""
+
+    def __init__(self, prefix="", start=0):
+        self.prefix = prefix
+        self.next_id = start
+
+    def observe(self, value):
+        """Record an existing ID such as "12" or "rId12"; other values are ignored."""
+        if not value or not value.startswith(self.prefix):
+            return
+        try:
+            number = int(value[len(self.prefix) :])
+        except ValueError:
+            return
+        if number >= self.next_id:
+            self.next_id = number + 1
+
+    def allocate(self):
+        value = self.next_id
+        self.next_id += 1
+        return value
+
+
+def _iter_elements(node):
+    """Yield an element and all of its descendant elements in document order."""
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if current.nodeType == current.ELEMENT_NODE:
+            yield current
+            stack.extend(reversed(current.childNodes))
 
 
 def _create_line_tracking_parser():
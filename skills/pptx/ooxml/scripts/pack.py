@@ -7,14 +7,40 @@ Example usage:
 """
 
 import argparse
+import os
 import shutil
 import subprocess
 import sys
 import tempfile
-import defusedxml.minidom
+import xml.parsers.expat
 import zipfile
 from pathlib import Path
 
+from defusedxml.common import EntitiesForbidden, ExternalReferenceForbidden
+
+try:
+    from .soffice_pool import PoolUnavailable, get_pool
+except ImportError:
+    from soffice_pool import PoolUnavailable, get_pool
+
+# Bytes handed to expat per read when condensing
+CONDENSE_CHUNK_SIZE = 1 << 16
+
+# Seconds allowed for the soffice validation conversion
+VALIDATION_TIMEOUT = 60
+
+# Already-compressed media, stored rather than deflated again
+STORED_EXTENSIONS = {
+    ".gif",
+    ".jpeg",
+    ".jpg",
+    ".m4a",
+    ".mp3",
+    ".mp4",
+    ".png",
+    ".wdp",
+}
+
 
 def main():
     parser = argparse.ArgumentParser(description="Pack a directory into an Office file")
@@ -45,6 +71,10 @@ def main():
 def pack_document(input_dir, output_file, validate=False):
     """Pack a directory into an Office file (.docx/.pptx/.xlsx).
 
+    Files are read straight from input_dir and written into the archive
+    once. XML parts are condensed on the way in, already-compressed media
+    is stored rather than deflated, and [Content_Types].xml is written first.
+
     Args:
         input_dir: Path to unpacked Office document directory
         output_file: Path to output Office file
@@ -61,34 +91,77 @@ def pack_document(input_dir, output_file, validate=False):
     if output_file.suffix.lower() not in {".docx", ".pptx", ".xlsx"}:
         raise ValueError(f"{output_file} must be a .docx, .pptx, or .xlsx file")
 
-    # Work in temporary directory to avoid modifying original
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_content_dir = Path(temp_dir) / "content"
-        shutil.copytree(input_dir, temp_content_dir)
-
-        # Process XML files to remove pretty-printing whitespace
-        for pattern in ["*.xml", "*.rels"]:
-            for xml_file in temp_content_dir.rglob(pattern):
-                condense_xml(xml_file)
-
-        # Create final Office file as zip archive
-        output_file.parent.mkdir(parents=True, exist_ok=True)
-        with zipfile.ZipFile(output_file, "w", zipfile.ZIP_DEFLATED) as zf:
-            for f in temp_content_dir.rglob("*"):
-                if f.is_file():
-                    zf.write(f, f.relative_to(temp_content_dir))
-
-        # Validate if requested
-        if validate:
-            if not validate_document(output_file):
-                output_file.unlink()  # Delete the corrupt file
-                return False
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    # List the parts before the temporary file exists, in case the output
+    # is inside input_dir
+    members = _package_members(input_dir, output_file)
+
+    # Write next to the output and replace it only once every part is packed,
+    # so a part that fails to condense leaves the previous file intact
+    with tempfile.NamedTemporaryFile(
+        dir=output_file.parent, suffix=output_file.suffix, delete=False
+    ) as temp:
+        temp_path = Path(temp.name)
+    try:
+        with zipfile.ZipFile(temp_path, "w", zipfile.ZIP_DEFLATED) as zf:
+            for f, arcname in members:
+                if f.suffix in {".xml", ".rels"}:
+                    # Remove pretty-printing whitespace
+                    zinfo = zipfile.ZipInfo.from_file(f, arcname)
+                    zinfo.compress_type = zipfile.ZIP_DEFLATED
+                    with zf.open(zinfo, "w") as dest:
+                        condense_xml(f, dest)
+                elif f.suffix.lower() in STORED_EXTENSIONS:
+                    zf.write(f, arcname, compress_type=zipfile.ZIP_STORED)
+                else:
+                    zf.write(f, arcname)
+        _set_output_mode(temp_path, output_file)
+        os.replace(temp_path, output_file)
+    finally:
+        temp_path.unlink(missing_ok=True)
+
+    # Validate if requested
+    if validate:
+        if not validate_document(output_file):
+            output_file.unlink()  # Delete the corrupt file
+            return False
 
     return True
 
 
+def _set_output_mode(temp_path, output_file):
+    """Give the temporary file (created 0600) the mode the output should have."""
+    if output_file.exists():
+        shutil.copymode(output_file, temp_path)
+    else:
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(temp_path, 0o666 & ~umask)
+
+
+def _package_members(input_dir, output_file):
+    """Return (path, arcname) for every file to pack, in OPC member order.
+
+    [Content_Types].xml comes first, as Office and other consumers expect;
+    the remaining parts follow in sorted order so output is deterministic.
+    """
+    output_file = output_file.resolve()
+    members = sorted(
+        (f.relative_to(input_dir).as_posix(), f)
+        for f in input_dir.rglob("*")
+        if f.is_file() and f.resolve() != output_file
+    )
+    members.sort(key=lambda member: member[0] != "[Content_Types].xml")
+    return [(f, arcname) for arcname, f in members]
+
+
 def validate_document(doc_path):
-    """Validate document by converting to HTML with soffice."""
+    """Validate document by converting to HTML with soffice.
+
+    The conversion runs on the shared soffice worker pool when it is
+    enabled (see soffice_pool), and in a one-shot soffice process otherwise
+    or if the pool fails.
+    """
     # Determine the correct filter based on file extension
     match doc_path.suffix.lower():
         case ".docx":
@@ -98,6 +171,29 @@ def validate_document(doc_path):
         case ".xlsx":
             filter_name = "html:HTML (StarCalc)"
 
+    # Both paths must produce <stem>.html for the document to pass. The pool
+    # is optional, so anything it fails to do is retried in a one-shot soffice
+    pool = get_pool()
+    if pool is not None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            try:
+                pool.convert(
+                    doc_path, temp_dir, filter_name, timeout=VALIDATION_TIMEOUT
+                )
+                if (Path(temp_dir) / f"{doc_path.stem}.html").exists():
+                    return True
+                error = "no HTML output"
+            except PoolUnavailable:
+                error = None
+            except Exception as e:
+                error = e
+            if error:
+                print(
+                    f"Warning: soffice pool conversion failed ({error}), "
+                    "retrying with a one-shot soffice",
+                    file=sys.stderr,
+                )
+
     with tempfile.TemporaryDirectory() as temp_dir:
         try:
             result = subprocess.run(
@@ -111,7 +207,7 @@ def validate_document(doc_path):
                     str(doc_path),
                 ],
                 capture_output=True,
-                timeout=10,
+                timeout=VALIDATION_TIMEOUT,
                 text=True,
             )
             if not (Path(temp_dir) / f"{doc_path.stem}.html").exists():
@@ -130,29 +226,174 @@ def validate_document(doc_path):
             return False
 
 
-def condense_xml(xml_file):
-    """Strip unnecessary whitespace and remove comments."""
-    with open(xml_file, "r", encoding="utf-8") as f:
-        dom = defusedxml.minidom.parse(f)
-
-    # Process each element to remove whitespace and comments
-    for element in dom.getElementsByTagName("*"):
-        # Skip w:t elements and their processing
-        if element.tagName.endswith(":t"):
-            continue
-
-        # Remove whitespace-only text nodes and comment nodes
-        for child in list(element.childNodes):
-            if (
-                child.nodeType == child.TEXT_NODE
-                and child.nodeValue
-                and child.nodeValue.strip() == ""
-            ) or child.nodeType == child.COMMENT_NODE:
-                element.removeChild(child)
-
-    # Write back the condensed XML
-    with open(xml_file, "wb") as f:
-        f.write(dom.toxml(encoding="UTF-8"))
+def condense_xml(xml_file, output=None):
+    """Strip unnecessary whitespace and remove comments.
+
+    The file is streamed through expat, so memory use depends on nesting
+    depth rather than file size. Whitespace-only text is dropped everywhere
+    except inside *:t elements, and comments inside the root element are
+    removed, except those directly inside *:t elements. The output is
+    byte-identical to re-serializing the part with minidom after the same
+    cleanup.
+
+    Args:
+        xml_file: Path to the XML file to condense
+        output: Binary file-like object to write to. If None, xml_file is
+            rewritten in place.
+    """
+    xml_file = Path(xml_file)
+    if output is not None:
+        with open(xml_file, "rb") as f:
+            _XMLCondenser(output).feed(f)
+        return
+
+    # Write alongside and swap in, so a parse error leaves the file intact
+    temp_file = xml_file.with_name(xml_file.name + ".condensed")
+    try:
+        with open(xml_file, "rb") as f, open(temp_file, "wb") as out:
+            _XMLCondenser(out).feed(f)
+        os.replace(temp_file, xml_file)
+    finally:
+        temp_file.unlink(missing_ok=True)
+
+
+class _XMLCondenser:
+    """Expat handlers that write a condensed copy of an XML stream.
+
+    Start tags are left open until the first child is written, so elements
+    that end up empty are written as <tag/>. Text between two markup events
+    is buffered and dropped if it is whitespace-only and its parent is not a
+    *:t element.
+    """
+
+    def __init__(self, output):
+        self._output = output
+        self._pieces = []
+        self._write = self._pieces.append
+        self._stack = []
+        self._text = []
+        self._cdata = None
+        self._start_open = False
+
+        parser = xml.parsers.expat.ParserCreate()
+        parser.buffer_text = True
+        parser.ordered_attributes = True
+        parser.StartElementHandler = self._start_element
+        parser.EndElementHandler = self._end_element
+        parser.CharacterDataHandler = self._character_data
+        parser.CommentHandler = self._comment
+        parser.ProcessingInstructionHandler = self._processing_instruction
+        parser.StartCdataSectionHandler = self._start_cdata
+        parser.EndCdataSectionHandler = self._end_cdata
+        # Same protections as defusedxml: no entity declarations or external
+        # references
+        parser.EntityDeclHandler = self._forbid_entity
+        parser.UnparsedEntityDeclHandler = self._forbid_unparsed_entity
+        parser.ExternalEntityRefHandler = self._forbid_external_reference
+        self._parser = parser
+
+    def feed(self, source):
+        """Condense everything read from a binary file object."""
+        self._write('<?xml version="1.0" encoding="UTF-8"?>')
+        while chunk := source.read(CONDENSE_CHUNK_SIZE):
+            self._parser.Parse(chunk, False)
+            self._flush_output()
+        self._parser.Parse(b"", True)
+        self._flush_output()
+
+    def _flush_output(self):
+        self._output.write("".join(self._pieces).encode("utf-8"))
+        self._pieces.clear()
+
+    def _open_child(self):
+        if self._start_open:
+            self._write(">")
+            self._start_open = False
+
+    def _flush_text(self):
+        if not self._text:
+            return
+        data = "".join(self._text)
+        self._text.clear()
+        if not self._stack:
+            return
+        # Keep whitespace in w:t, a:t, etc.; drop pretty-printing elsewhere
+        if data.strip() == "" and not self._stack[-1].endswith(":t"):
+            return
+        self._open_child()
+        self._write(_escape(data))
+
+    def _start_element(self, name, attributes):
+        self._flush_text()
+        self._open_child()
+        self._write("<" + name)
+        if attributes:
+            # Namespace declarations first, as minidom serializes them
+            pairs = list(zip(attributes[::2], attributes[1::2]))
+            pairs.sort(key=lambda pair: not pair[0].startswith("xmlns"))
+            self._write(
+                "".join(f' {key}="{_escape(value)}"' for key, value in pairs)
+            )
+        self._start_open = True
+        self._stack.append(name)
+
+    def _end_element(self, name):
+        self._flush_text()
+        self._stack.pop()
+        if self._start_open:
+            self._write("/>")
+            self._start_open = False
+        else:
+            self._write(f"</{name}>")
+
+    def _character_data(self, data):
+        if self._cdata is not None:
+            self._cdata.append(data)
+        else:
+            self._text.append(data)
+
+    def _comment(self, data):
+        self._flush_text()
+        # Comments outside the root element survive, and so do comments
+        # directly in w:t, a:t, etc., whose children are left untouched
+        if not self._stack or self._stack[-1].endswith(":t"):
+            self._open_child()
+            self._write(f"<!--{data}-->")
+
+    def _processing_instruction(self, target, data):
+        self._flush_text()
+        self._open_child()
+        self._write(f"<?{target} {data}?>")
+
+    def _start_cdata(self):
+        self._flush_text()
+        self._cdata = []
+
+    def _end_cdata(self):
+        self._open_child()
+        self._write(f"<![CDATA[{''.join(self._cdata)}]]>")
+        self._cdata = None
+
+    def _forbid_entity(
+        self, name, is_parameter_entity, value, base, sysid, pubid, notation_name
+    ):
+        raise EntitiesForbidden(name, value, base, sysid, pubid, notation_name)
+
+    def _forbid_unparsed_entity(self, name, base, sysid, pubid, notation_name):
+        raise EntitiesForbidden(name, None, base, sysid, pubid, notation_name)
+
+    def _forbid_external_reference(self, context, base, sysid, pubid):
+        raise ExternalReferenceForbidden(context, base, sysid, pubid)
+
+
+def _escape(data):
+    """Escape text or an attribute value the way minidom does."""
+    return (
+        data.replace("&", "&amp;")
+        .replace("<", "&lt;")
+        .replace('"', "&quot;")
+        .replace(">", "&gt;")
+    )
 
 
 if __name__ == "__main__":
@@ -2,11 +2,65 @@
 Base validator with common validation logic for document files.
 """
 
+import os
 import re
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 import lxml.etree
 
+from .baseline import ValidationBaseline
+from .package import OriginalPackage
+
+# Compiled XSD schemas keyed by resolved schema path. Compiling wml.xsd or
+# pml.xsd pulls in a dozen imported schema files, so each schema is compiled
+# at most once per process and shared by every validator instance.
+_SCHEMA_CACHE = {}
+
+
+def get_compiled_schema(schema_path):
+    """Return the compiled XMLSchema for schema_path, compiling it on first use.
+
+    Args:
+        schema_path: Path to the XSD file
+
+    Returns:
+        lxml.etree.XMLSchema: The compiled schema
+    """
+    schema_path = Path(schema_path).resolve()
+    schema = _SCHEMA_CACHE.get(schema_path)
+    if schema is None:
+        with open(schema_path, "rb") as xsd_file:
+            parser = lxml.etree.XMLParser()
+            xsd_doc = lxml.etree.parse(
+                xsd_file, parser=parser, base_url=str(schema_path)
+            )
+        schema = lxml.etree.XMLSchema(xsd_doc)
+        _SCHEMA_CACHE[schema_path] = schema
+    return schema
+
+
+def clear_schema_cache():
+    """Drop all compiled schemas (mainly useful for benchmarking)."""
+    _SCHEMA_CACHE.clear()
+
+
+# Validator owned by a process-pool worker; each worker keeps its own schema
+# cache and its own view of the original package for the lifetime of the pool.
+_worker_validator = None
+
+
+def _init_xsd_worker(validator_class, unpacked_dir, original_file):
+    """Create the validator used by this worker process."""
+    global _worker_validator
+    _worker_validator = validator_class(unpacked_dir, original_file)
+
+
+def _validate_file_xsd_in_worker(xml_file):
+    """Validate one file against its XSD schema inside a worker process."""
+    return _worker_validator.validate_file_against_xsd(xml_file, verbose=False)
+
 
 class BaseSchemaValidator:
     """Base validator with common validation logic for document files."""
@@ -103,11 +157,27 @@ class BaseSchemaValidator:
         "http://www.w3.org/XML/1998/namespace",
     }
 
-    def __init__(self, unpacked_dir, original_file, verbose=False):
+    def __init__(
+        self,
+        unpacked_dir,
+        original_file,
+        verbose=False,
+        original_package=None,
+        jobs=1,
+        baseline=None,
+    ):
         self.unpacked_dir = Path(unpacked_dir).resolve()
         self.original_file = Path(original_file)
         self.verbose = verbose
 
+        # Number of worker processes for XSD validation (0 means one per CPU)
+        self.jobs = jobs or os.cpu_count() or 1
+
+        # Shared view of the original file; pass one in to reuse it across validators
+        self.original_package = original_package or OriginalPackage(
+            self.original_file
+        )
+
         # Set schemas directory
         self.schemas_dir = Path(__file__).parent.parent.parent / "schemas"
 
@@ -120,18 +190,86 @@ class BaseSchemaValidator:
         if not self.xml_files:
             print(f"Warning: No XML files found in {self.unpacked_dir}")
 
+        # Parsed trees shared by all checks, so each part is parsed only once
+        self._trees = {}
+
+        # Wall-clock seconds spent in each check, keyed by method name
+        self.check_timings = {}
+
+        # Incremental mode: parts byte-identical to the last successfully
+        # validated baseline skip file-local checks
+        self.baseline = baseline
+        self.part_hashes = {}
+        self.unchanged_parts = set()
+        self.parts_added_or_removed = True
+        if baseline is not None:
+            self.part_hashes = ValidationBaseline.hash_parts(self.unpacked_dir)
+            self.unchanged_parts = {
+                name
+                for name, digest in self.part_hashes.items()
+                if baseline.hashes.get(name) == digest
+            }
+            self.parts_added_or_removed = set(self.part_hashes) != set(
+                baseline.hashes
+            )
+
+        # Global-scope IDs found in each part, recorded for the next baseline
+        self.global_ids_by_part = {}
+
     def validate(self):
         """Run all validation checks and return True if all pass."""
         raise NotImplementedError("Subclasses must implement the validate method")
 
+    def print_timings(self):
+        """Print the time spent in each check run so far."""
+        total = sum(self.check_timings.values())
+        print(f"{type(self).__name__} timings ({total * 1000:.1f} ms total):")
+        for name, seconds in self.check_timings.items():
+            print(f"  - {name}: {seconds * 1000:.1f} ms")
+
+    def _run_check(self, check):
+        """Run a single validation check and record how long it took."""
+        start = time.perf_counter()
+        try:
+            return check()
+        finally:
+            self.check_timings[check.__name__] = time.perf_counter() - start
+
+    def is_unchanged(self, path):
+        """Return True if a part is unchanged since the last successful validation.
+
+        Args:
+            path: Absolute path, or path relative to unpacked_dir
+        """
+        path = Path(path)
+        if path.is_absolute():
+            path = path.relative_to(self.unpacked_dir)
+        return path.as_posix() in self.unchanged_parts
+
+    def _parse_xml(self, xml_file):
+        """Parse an XML file, reusing the tree if an earlier check parsed it.
+
+        The returned tree is shared between checks and must not be modified.
+
+        Raises:
+            lxml.etree.XMLSyntaxError: If the file is not well-formed
+        """
+        tree = self._trees.get(xml_file)
+        if tree is None:
+            tree = lxml.etree.parse(str(xml_file))
+            self._trees[xml_file] = tree
+        return tree
+
     def validate_xml(self):
         """Validate that all XML files are well-formed."""
         errors = []
 
         for xml_file in self.xml_files:
+            if self.is_unchanged(xml_file):
+                continue
             try:
                 # Try to parse the XML file
-                lxml.etree.parse(str(xml_file))
+                self._parse_xml(xml_file)
             except lxml.etree.XMLSyntaxError as e:
                 errors.append(
                     f"  {xml_file.relative_to(self.unpacked_dir)}: "
@@ -158,8 +296,10 @@ class BaseSchemaValidator:
         errors = []
 
         for xml_file in self.xml_files:
+            if self.is_unchanged(xml_file):
+                continue
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
+                root = self._parse_xml(xml_file).getroot()
                 declared = set(root.nsmap.keys()) - {None}  # Exclude default namespace
 
                 for attr_val in [
@@ -189,19 +329,40 @@ class BaseSchemaValidator:
         global_ids = {}  # Track globally unique IDs across all files
 
         for xml_file in self.xml_files:
+            part_name = xml_file.relative_to(self.unpacked_dir).as_posix()
+            if self.is_unchanged(xml_file):
+                # File-level IDs passed last time; only replay its global IDs
+                part_global_ids = self.baseline.global_ids.get(part_name, [])
+                self.global_ids_by_part[part_name] = part_global_ids
+                for id_value, line, tag in part_global_ids:
+                    if id_value in global_ids:
+                        prev_file, prev_line, prev_tag = global_ids[id_value]
+                        errors.append(
+                            f"  {part_name}: "
+                            f"Line {line}: Global ID '{id_value}' in <{tag}> "
+                            f"already used in {prev_file} at line {prev_line} in <{prev_tag}>"
+                        )
+                    else:
+                        global_ids[id_value] = (Path(part_name), line, tag)
+                continue
+
+            part_global_ids = self.global_ids_by_part[part_name] = []
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
+                root = self._parse_xml(xml_file).getroot()
                 file_ids = {}  # Track IDs that must be unique within this file
 
-                # Remove all mc:AlternateContent elements from the tree
-                mc_elements = root.xpath(
-                    ".//mc:AlternateContent", namespaces={"mc": self.MC_NAMESPACE}
-                )
-                for elem in mc_elements:
-                    elem.getparent().remove(elem)
+                # Walk the tree in document order, skipping mc:AlternateContent
+                # subtrees (the tree is shared, so they are not removed from it)
+                alternate_content_tag = f"{{{self.MC_NAMESPACE}}}AlternateContent"
+                stack = [root]
+                while stack:
+                    elem = stack.pop()
+                    stack.extend(
+                        child
+                        for child in reversed(elem)
+                        if child.tag != alternate_content_tag
+                    )
 
-                # Now check IDs in the cleaned tree
-                for elem in root.iter():
                     # Get the element name without namespace
                     tag = (
                         elem.tag.split("}")[-1].lower()
@@ -227,6 +388,9 @@ class BaseSchemaValidator:
 
                         if id_value is not None:
                             if scope == "global":
+                                part_global_ids.append(
+                                    (id_value, elem.sourceline, tag)
+                                )
                                 # Check global uniqueness
                                 if id_value in global_ids:
                                     prev_file, prev_line, prev_tag = global_ids[
@@ -288,6 +452,14 @@ class BaseSchemaValidator:
                 print("PASSED - No .rels files found")
             return True
 
+        # References can only break if a .rels file changed or parts came or went
+        if not self.parts_added_or_removed and all(
+            self.is_unchanged(f) for f in rels_files
+        ):
+            if self.verbose:
+                print("PASSED - No .rels or part changes since last validation")
+            return True
+
         # Get all files in the unpacked directory (excluding reference files)
         all_files = []
         for file_path in self.unpacked_dir.rglob("*"):
@@ -310,7 +482,7 @@ class BaseSchemaValidator:
         for rels_file in rels_files:
             try:
                 # Parse relationships file
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
+                rels_root = self._parse_xml(rels_file).getroot()
 
                 # Get the directory where this .rels file is located
                 rels_dir = rels_file.parent
@@ -390,8 +562,6 @@ class BaseSchemaValidator:
         Validate that all r:id attributes in XML files reference existing IDs
         in their corresponding .rels files, and optionally validate relationship types.
         """
-        import lxml.etree
-
         errors = []
 
         # Process each XML file that might contain r:id references
@@ -409,9 +579,13 @@ class BaseSchemaValidator:
             if not rels_file.exists():
                 continue
 
+            # Skip if neither the file nor its .rels changed since last validation
+            if self.is_unchanged(xml_file) and self.is_unchanged(rels_file):
+                continue
+
             try:
                 # Parse the .rels file to get valid relationship IDs and their types
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
+                rels_root = self._parse_xml(rels_file).getroot()
                 rid_to_type = {}
 
                 for rel in rels_root.findall(
@@ -434,7 +608,7 @@ class BaseSchemaValidator:
                         rid_to_type[rid] = type_name
 
                 # Parse the XML file to find all r:id references
-                xml_root = lxml.etree.parse(str(xml_file)).getroot()
+                xml_root = self._parse_xml(xml_file).getroot()
 
                 # Find all elements with r:id attributes
                 for elem in xml_root.iter():
@@ -531,7 +705,7 @@ class BaseSchemaValidator:
 
         try:
             # Parse and get all declared parts and extensions
-            root = lxml.etree.parse(str(content_types_file)).getroot()
+            root = self._parse_xml(content_types_file).getroot()
             declared_parts = set()
             declared_extensions = set()
 
@@ -575,12 +749,20 @@ class BaseSchemaValidator:
                 "emf": "image/x-emf",
             }
 
-            # Get all files in the unpacked directory
-            all_files = list(self.unpacked_dir.rglob("*"))
-            all_files = [f for f in all_files if f.is_file()]
+            # With [Content_Types].xml and the set of parts unchanged, only
+            # modified parts need re-checking
+            content_types_unchanged = self.is_unchanged(content_types_file)
+            if content_types_unchanged and not self.parts_added_or_removed:
+                all_files = []
+            else:
+                # Get all files in the unpacked directory
+                all_files = list(self.unpacked_dir.rglob("*"))
+                all_files = [f for f in all_files if f.is_file()]
 
             # Check all XML files for Override declarations
             for xml_file in self.xml_files:
+                if content_types_unchanged and self.is_unchanged(xml_file):
+                    continue
                 path_str = str(xml_file.relative_to(self.unpacked_dir)).replace(
                     "\\", "/"
                 )
@@ -593,7 +775,7 @@ class BaseSchemaValidator:
                     continue
 
                 try:
-                    root_tag = lxml.etree.parse(str(xml_file)).getroot().tag
+                    root_tag = self._parse_xml(xml_file).getroot().tag
                     root_name = root_tag.split("}")[-1] if "}" in root_tag else root_tag
 
                     if root_name in declarable_roots and path_str not in declared_parts:
@@ -692,11 +874,11 @@ class BaseSchemaValidator:
         valid_count = 0
         skipped_count = 0
 
-        for xml_file in self.xml_files:
+        # Results come back in self.xml_files order, whether serial or parallel
+        for xml_file, (is_valid, new_file_errors) in zip(
+            self.xml_files, self._validate_files_against_xsd()
+        ):
             relative_path = str(xml_file.relative_to(self.unpacked_dir))
-            is_valid, new_file_errors = self.validate_file_against_xsd(
-                xml_file, verbose=False
-            )
 
             if is_valid is None:
                 skipped_count += 1
@@ -712,7 +894,7 @@ class BaseSchemaValidator:
 
             # Has new errors
             new_errors.append(f"  {relative_path}: {len(new_file_errors)} new error(s)")
-            for error in list(new_file_errors)[:3]:  # Show first 3 errors
+            for error in sorted(new_file_errors)[:3]:  # Show first 3 errors
                 new_errors.append(
                     f"    - {error[:250]}..." if len(error) > 250 else f"    - {error}"
                 )
@@ -738,6 +920,61 @@ class BaseSchemaValidator:
                 print("\nPASSED - No new XSD validation errors introduced")
             return True
 
+    def _validate_files_against_xsd(self):
+        """Validate every file in self.xml_files against its XSD schema.
+
+        Parts unchanged since the baseline are reported valid without being
+        re-checked. With jobs > 1, the remaining files that have a schema are
+        fanned out over a process pool. Each worker builds its own validator
+        (and so its own compiled schema cache); results are returned in
+        self.xml_files order.
+
+        Returns:
+            list: (is_valid, new_errors_set) tuples, one per file
+        """
+        # Unchanged parts had no new errors at the last successful validation
+        unchanged_files = {
+            f
+            for f in self.xml_files
+            if self.is_unchanged(f) and self._get_schema_path(f)
+        }
+        schema_files = [
+            f
+            for f in self.xml_files
+            if self._get_schema_path(f) and f not in unchanged_files
+        ]
+        if self.jobs <= 1 or len(schema_files) <= 1:
+            return [
+                (True, set())
+                if xml_file in unchanged_files
+                else self.validate_file_against_xsd(xml_file, verbose=False)
+                for xml_file in self.xml_files
+            ]
+
+        workers = min(self.jobs, len(schema_files))
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_xsd_worker,
+            initargs=(type(self), self.unpacked_dir, self.original_file),
+        ) as executor:
+            schema_results = dict(
+                zip(
+                    schema_files,
+                    executor.map(
+                        _validate_file_xsd_in_worker,
+                        schema_files,
+                        chunksize=max(1, len(schema_files) // (workers * 4)),
+                    ),
+                )
+            )
+
+        return [
+            (True, set())
+            if f in unchanged_files
+            else schema_results.get(f, (None, set()))
+            for f in self.xml_files
+        ]
+
     def _get_schema_path(self, xml_file):
         """Determine the appropriate schema path for an XML file."""
         # Check exact filename match
@@ -830,23 +1067,32 @@ class BaseSchemaValidator:
             return None, None  # Skip file
 
         try:
-            # Load schema
-            with open(schema_path, "rb") as xsd_file:
-                parser = lxml.etree.XMLParser()
-                xsd_doc = lxml.etree.parse(
-                    xsd_file, parser=parser, base_url=str(schema_path)
-                )
-                schema = lxml.etree.XMLSchema(xsd_doc)
+            xml_doc = self._parse_xml(xml_file)
+            return self._validate_doc_xsd(
+                xml_doc, schema_path, xml_file.relative_to(base_path)
+            )
+        except Exception as e:
+            return False, {str(e)}
+
+    def _validate_doc_xsd(self, xml_doc, schema_path, relative_path):
+        """Validate a parsed XML document against an XSD schema.
+
+        Args:
+            xml_doc: Parsed lxml ElementTree (not modified)
+            schema_path: Path to the XSD schema
+            relative_path: Path of the part relative to the package root
 
-            # Load and preprocess XML
-            with open(xml_file, "r") as f:
-                xml_doc = lxml.etree.parse(f)
+        Returns:
+            tuple: (is_valid, errors_set)
+        """
+        try:
+            # Load schema (compiled once per process)
+            schema = get_compiled_schema(schema_path)
 
             xml_doc, _ = self._remove_template_tags_from_text_nodes(xml_doc)
             xml_doc = self._preprocess_for_mc_ignorable(xml_doc)
 
             # Clean ignorable namespaces if needed
-            relative_path = xml_file.relative_to(base_path)
             if (
                 relative_path.parts
                 and relative_path.parts[0] in self.MAIN_CONTENT_FOLDERS
@@ -869,39 +1115,41 @@ class BaseSchemaValidator:
     def _get_original_file_errors(self, xml_file):
         """Get XSD validation errors from a single file in the original document.
 
+        The part is read from the shared original package, so the original file
+        is never unpacked to disk. Results are cached per part for the session.
+
         Args:
             xml_file: Path to the XML file in unpacked_dir to check
 
         Returns:
             set: Set of error messages from the original file
         """
-        import tempfile
-        import zipfile
-
         # Resolve both paths to handle symlinks (e.g., /var vs /private/var on macOS)
         xml_file = Path(xml_file).resolve()
         unpacked_dir = self.unpacked_dir.resolve()
         relative_path = xml_file.relative_to(unpacked_dir)
+        part_name = relative_path.as_posix()
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
+        package = self.original_package
+        if part_name in package.xsd_errors:
+            return package.xsd_errors[part_name]
 
-            # Extract original file
-            with zipfile.ZipFile(self.original_file, "r") as zip_ref:
-                zip_ref.extractall(temp_path)
-
-            # Find corresponding file in original
-            original_xml_file = temp_path / relative_path
-
-            if not original_xml_file.exists():
+        schema_path = self._get_schema_path(xml_file)
+        try:
+            original_doc = package.parse(part_name)
+        except Exception as e:
+            errors = {str(e)}
+        else:
+            if original_doc is None or not schema_path:
                 # File didn't exist in original, so no original errors
-                return set()
+                errors = set()
+            else:
+                _, errors = self._validate_doc_xsd(
+                    original_doc, schema_path, relative_path
+                )
 
-            # Validate the specific file in original
-            is_valid, errors = self._validate_single_file_xsd(
-                original_xml_file, temp_path
-            )
-            return errors if errors else set()
+        package.xsd_errors[part_name] = errors
+        return errors
 
     def _remove_template_tags_from_text_nodes(self, xml_doc):
         """Remove template tags from XML text nodes and collect warnings.
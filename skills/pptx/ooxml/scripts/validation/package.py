@@ -0,0 +1,121 @@
+"""
+Read-only view of the original Office file shared by all validators.
+"""
+
+import zipfile
+from pathlib import Path
+
+import lxml.etree
+
+
+class OriginalPackage:
+    """Read-only, in-memory view of the original .docx/.pptx/.xlsx file.
+
+    The original can be the packed file or its unpacked directory. The zip
+    archive is opened once per validation session and members are read
+    lazily, only when a validator asks for them. Parsed XML trees and
+    per-part XSD error sets are cached so that the schema validator, the
+    paragraph counter and the redlining validator never unpack the original
+    more than once.
+
+    Attributes:
+        path: Path to the original Office file
+        xsd_errors: Cache of XSD error sets keyed by part name
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path: Path to the original Office file or unpacked directory (str or Path)
+        """
+        self.path = Path(path)
+        self.xsd_errors = {}
+        self._directory = self.path.is_dir()
+        self._zip = None
+        self._names = None
+        self._members = {}
+        self._trees = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __contains__(self, name):
+        return self._normalize(name) in self.names
+
+    @property
+    def names(self):
+        """Set of member names in the original (forward-slash separated)."""
+        if self._names is None:
+            if self._directory:
+                self._names = {
+                    file_path.relative_to(self.path).as_posix()
+                    for file_path in self.path.rglob("*")
+                    if file_path.is_file()
+                }
+            else:
+                self._names = set(self._open().namelist())
+        return self._names
+
+    def read(self, name):
+        """Return the raw bytes of a member, or None if it does not exist."""
+        name = self._normalize(name)
+        if name not in self._members:
+            if name not in self.names:
+                return None
+            if self._directory:
+                self._members[name] = (self.path / name).read_bytes()
+            else:
+                self._members[name] = self._open().read(name)
+        return self._members[name]
+
+    def preload(self, names):
+        """Read members into memory now, so the view survives the source changing.
+
+        Use this before overwriting parts of an unpacked original directory.
+        Names that do not exist in the original are ignored.
+        """
+        for name in names:
+            self.read(name)
+
+    def parse(self, name):
+        """Return the parsed lxml tree of a member, or None if it does not exist.
+
+        The returned tree is shared; callers that need to modify it must
+        work on a copy.
+
+        Raises:
+            lxml.etree.XMLSyntaxError: If the member is not well-formed XML
+        """
+        name = self._normalize(name)
+        if name not in self._trees:
+            content = self.read(name)
+            if content is None:
+                return None
+            self._trees[name] = lxml.etree.ElementTree(
+                lxml.etree.fromstring(content, base_url=name)
+            )
+        return self._trees[name]
+
+    def close(self):
+        """Close the underlying archive and drop all cached content."""
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+        self._members.clear()
+        self._trees.clear()
+
+    def _open(self):
+        if self._zip is None:
+            self._zip = zipfile.ZipFile(self.path, "r")
+        return self._zip
+
+    @staticmethod
+    def _normalize(name):
+        return str(name).replace("\\", "/").lstrip("/")
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
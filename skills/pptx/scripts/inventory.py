@@ -12,29 +12,41 @@ This module provides functionality to:
 
 Classes:
     ParagraphData: Represents a text paragraph with formatting
+    FontRegistry: Finds, loads and measures fonts, once per process
+    StyleTable: Default font sizes of a slide layout and its master, read once
     ShapeData: Represents a shape with position and text content
 
 Main Functions:
     extract_text_inventory: Extract all text from a presentation
+    extract_slide_inventory: Extract all text from one slide
     save_inventory: Save extracted data to JSON
 
 Usage:
-    python inventory.py input.pptx output.json
+    python inventory.py input.pptx output.json [--jobs N]
 """
 
 import argparse
+import functools
 import json
+import os
 import platform
 import sys
+import weakref
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple, Union
 
-from PIL import Image, ImageDraw, ImageFont
+from PIL import ImageFont
 from pptx import Presentation
 from pptx.enum.text import PP_ALIGN
 from pptx.shapes.base import BaseShape
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 # Type aliases for cleaner signatures
 JsonValue = Union[str, int, float, bool, None]
 ParagraphDict = Dict[str, JsonValue]
@@ -46,6 +58,12 @@ InventoryData = Dict[
 ]  # Dict of slide_id -> {shape_id -> ShapeData}
 InventoryDict = Dict[str, Dict[str, ShapeDict]]  # JSON-serializable inventory
 
+# Slides with at least this many shapes check overlaps with NumPy, if installed
+NUMPY_OVERLAP_MIN_SHAPES = 200
+
+DRAWINGML_NS = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+PRESENTATIONML_NS = "{http://schemas.openxmlformats.org/presentationml/2006/main}"
+
 
 def main():
     """Main entry point for command-line usage."""
@@ -60,6 +78,9 @@ Examples:
   python inventory.py presentation.pptx inventory.json --issues-only
     Extracts only text shapes that have overflow or overlap issues
 
+  python inventory.py presentation.pptx inventory.json --jobs 0
+    Extracts slides in parallel, with one worker process per CPU
+
 The output JSON includes:
   - All text content organized by slide and shape
   - Correct absolute positions for shapes in groups
@@ -76,6 +97,13 @@ The output JSON includes:
         action="store_true",
         help="Include only text shapes that have overflow or overlap issues",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes to extract slides with (0 = one per CPU, default: 1)",
+    )
 
     args = parser.parse_args()
 
@@ -94,7 +122,9 @@ The output JSON includes:
             print(
                 "Filtering to include only text shapes with issues (overflow/overlap)"
             )
-        inventory = extract_text_inventory(input_path, issues_only=args.issues_only)
+        inventory = extract_text_inventory(
+            input_path, issues_only=args.issues_only, jobs=args.jobs, keep_shapes=False
+        )
 
         output_path = Path(args.output)
         output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -137,6 +167,24 @@ class ShapeWithPosition:
 class ParagraphData:
     """Data structure for paragraph properties extracted from a PowerPoint paragraph."""
 
+    # Compact records: large inventories hold one per paragraph
+    __slots__ = (
+        "text",
+        "bullet",
+        "level",
+        "alignment",
+        "space_before",
+        "space_after",
+        "font_name",
+        "font_size",
+        "bold",
+        "italic",
+        "underline",
+        "color",
+        "theme_color",
+        "line_spacing",
+    )
+
     def __init__(self, paragraph: Any):
         """Initialize from a PowerPoint paragraph object.
 
@@ -263,84 +311,271 @@ class ParagraphData:
         return result
 
 
-class ShapeData:
-    """Data structure for shape properties extracted from a PowerPoint shape."""
-
-    @staticmethod
-    def emu_to_inches(emu: int) -> float:
-        """Convert EMUs (English Metric Units) to inches."""
-        return emu / 914400.0
-
-    @staticmethod
-    def inches_to_pixels(inches: float, dpi: int = 96) -> int:
-        """Convert inches to pixels at given DPI."""
-        return int(inches * dpi)
-
-    @staticmethod
-    def get_font_path(font_name: str) -> Optional[str]:
-        """Get the font file path for a given font name.
+class FontMetrics:
+    """A loaded font with cached advance widths of the words measured with it."""
 
+    def __init__(self, font: Any):
+        """
         Args:
-            font_name: Name of the font (e.g., 'Arial', 'Calibri')
+            font: PIL font (FreeTypeFont, or the default font)
+        """
+        self.font = font
+        self._widths: Dict[str, float] = {}
+        self.space_width = self.width(" ")
+
+    def width(self, text: str) -> float:
+        """Return the advance width of text in pixels, measuring it only once."""
+        width = self._widths.get(text)
+        if width is None:
+            width = self._widths[text] = self.font.getlength(text)
+        return width
+
+
+class FontRegistry:
+    """Font lookups and text measurement shared by every shape in a process.
+
+    Each font directory is listed once, on the first lookup, and each font
+    name is resolved once against those listings, with the same precedence as
+    probing the file system: directories in order, exact file names before
+    files merely containing the font name. Fonts are loaded once per (path,
+    size) and kept in an LRU cache together with their word widths.
+    """
 
-        Returns:
-            Path to the font file, or None if not found
+    def __init__(self, font_cache_size: int = 64):
+        """
+        Args:
+            font_cache_size: Number of (path, size) fonts kept loaded
         """
         system = platform.system()
-
-        # Common font file variations to try
-        font_variations = [
-            font_name,
-            font_name.lower(),
-            font_name.replace(" ", ""),
-            font_name.replace(" ", "-"),
-        ]
-
-        # Define font directories and extensions by platform
         if system == "Darwin":  # macOS
-            font_dirs = [
+            self.font_dirs = [
                 "/System/Library/Fonts/",
                 "/Library/Fonts/",
                 "~/Library/Fonts/",
             ]
-            extensions = [".ttf", ".otf", ".ttc", ".dfont"]
+            self.extensions = [".ttf", ".otf", ".ttc", ".dfont"]
         else:  # Linux
-            font_dirs = [
+            self.font_dirs = [
                 "/usr/share/fonts/truetype/",
                 "/usr/local/share/fonts/",
                 "~/.fonts/",
             ]
-            extensions = [".ttf", ".otf"]
-
-        # Try to find the font file
-        from pathlib import Path
+            self.extensions = [".ttf", ".otf"]
+        # macOS file systems are case-insensitive, so exact matches are too
+        self._case_sensitive = system != "Darwin"
+        self._listings: Optional[List[Tuple[Dict[str, Path], List[Path]]]] = None
+        self._paths: Dict[str, Optional[str]] = {}
+        self.metrics = functools.lru_cache(maxsize=font_cache_size)(self._load)
+
+    def find(self, font_name: str) -> Optional[str]:
+        """Get the font file path for a given font name, or None if not found."""
+        if font_name not in self._paths:
+            self._paths[font_name] = self._find(font_name)
+        return self._paths[font_name]
+
+    def metrics_for(self, font_name: str, size: int) -> FontMetrics:
+        """Return the metrics of a font by name, falling back to PIL's default font."""
+        return self.metrics(self.find(font_name), size)
+
+    def _load(self, font_path: Optional[str], size: int) -> FontMetrics:
+        font = None
+        if font_path:
+            try:
+                font = ImageFont.truetype(font_path, size=size)
+            except Exception:
+                pass
+        return FontMetrics(font or ImageFont.load_default())
 
-        for font_dir in font_dirs:
-            font_dir_path = Path(font_dir).expanduser()
-            if not font_dir_path.exists():
-                continue
+    def _find(self, font_name: str) -> Optional[str]:
+        # Common font file variations to try
+        font_variations = [
+            font_name,
+            font_name.lower(),
+            font_name.replace(" ", ""),
+            font_name.replace(" ", "-"),
+        ]
+        font_name_lower = font_name.lower().replace(" ", "")
 
+        for names, files in self._list_font_dirs():
             # First try exact matches
             for variant in font_variations:
-                for ext in extensions:
-                    font_path = font_dir_path / f"{variant}{ext}"
-                    if font_path.exists():
-                        return str(font_path)
+                for ext in self.extensions:
+                    file_name = f"{variant}{ext}"
+                    if not self._case_sensitive:
+                        file_name = file_name.lower()
+                    if file_name in names:
+                        return str(names[file_name])
 
             # Then try fuzzy matching - find files containing the font name
+            for file_path in files:
+                file_name_lower = file_path.name.lower()
+                if font_name_lower in file_name_lower and any(
+                    file_name_lower.endswith(ext) for ext in self.extensions
+                ):
+                    return str(file_path)
+
+        return None
+
+    def _list_font_dirs(self) -> List[Tuple[Dict[str, Path], List[Path]]]:
+        """List every font directory once: (name -> path of all entries, files)."""
+        if self._listings is None:
+            self._listings = []
+            for font_dir in self.font_dirs:
+                font_dir_path = Path(font_dir).expanduser()
+                try:
+                    entries = list(font_dir_path.iterdir())
+                except (OSError, PermissionError):
+                    continue
+                names = {}
+                for entry in entries:
+                    name = entry.name if self._case_sensitive else entry.name.lower()
+                    names.setdefault(name, entry)
+                files = [entry for entry in entries if entry.is_file()]
+                self._listings.append((names, files))
+        return self._listings
+
+
+# Shared by all shapes, so fonts are found, loaded and measured once per process
+FONT_REGISTRY = FontRegistry()
+
+
+class StyleTable:
+    """Default font sizes of a slide layout and its master, read once.
+
+    Use style_table() to get the shared table of a layout instead of building
+    one per shape. Tables are cached per process, so every inventory taken by
+    replace.py or thumbnail.py reuses them.
+
+    Attributes:
+        layout_sizes: Placeholder type -> font size of the layout placeholder
+        master_sizes: "titleStyle", "bodyStyle" or "otherStyle" -> font size
+            of the master's text style
+    """
+
+    def __init__(self, slide_layout: Any):
+        """Build the table of a slide layout.
+
+        Args:
+            slide_layout: Slide layout; its master's sizes are shared with
+                every other layout of that master
+        """
+        self.master_sizes = _master_font_sizes(slide_layout.slide_master)
+        self.layout_sizes: Dict[Any, Optional[float]] = {}
+        for placeholder in slide_layout.placeholders:
             try:
-                for file_path in font_dir_path.iterdir():
-                    if file_path.is_file():
-                        file_name_lower = file_path.name.lower()
-                        font_name_lower = font_name.lower().replace(" ", "")
-                        if font_name_lower in file_name_lower and any(
-                            file_name_lower.endswith(ext) for ext in extensions
-                        ):
-                            return str(file_path)
-            except (OSError, PermissionError):
+                placeholder_type = placeholder.placeholder_format.type
+            except Exception:
                 continue
+            if placeholder_type not in self.layout_sizes:
+                self.layout_sizes[placeholder_type] = _first_font_size(
+                    placeholder.element
+                )
 
-        return None
+    def layout_font_size(self, placeholder_type: Any) -> Optional[float]:
+        """Default font size set on the layout placeholder of a type, if any."""
+        return self.layout_sizes.get(placeholder_type)
+
+    def master_font_size(self, style_name: str) -> int:
+        """Whole font size of a master text style, 14 if it sets none."""
+        size = self.master_sizes.get(style_name)
+        if size is not None:
+            return int(size)
+        return 14  # Conservative default for body text
+
+
+# Style tables by layout part and text style sizes by master part, so each
+# layout and master is only read once per process
+_STYLE_TABLES: "weakref.WeakKeyDictionary[Any, StyleTable]" = (
+    weakref.WeakKeyDictionary()
+)
+_MASTER_FONT_SIZES: "weakref.WeakKeyDictionary[Any, Dict[str, Optional[float]]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def style_table(slide_layout: Any) -> StyleTable:
+    """Return the shared StyleTable of a slide layout, building it on first use."""
+    table = _STYLE_TABLES.get(slide_layout.part)
+    if table is None:
+        table = _STYLE_TABLES[slide_layout.part] = StyleTable(slide_layout)
+    return table
+
+
+def _master_font_sizes(slide_master: Any) -> Dict[str, Optional[float]]:
+    """Font sizes of a slide master's text styles, read once per master."""
+    sizes = _MASTER_FONT_SIZES.get(slide_master.part)
+    if sizes is None:
+        sizes = {}
+        tx_styles = slide_master.element.find(f"{PRESENTATIONML_NS}txStyles")
+        if tx_styles is not None:
+            for style in tx_styles:
+                if isinstance(style.tag, str):
+                    sizes[style.tag.split("}")[-1]] = _first_font_size(style)
+        _MASTER_FONT_SIZES[slide_master.part] = sizes
+    return sizes
+
+
+def _first_font_size(element: Any) -> Optional[float]:
+    """First default run size (in points) set in an element's subtree, if any."""
+    for def_rpr in element.iter(f"{DRAWINGML_NS}defRPr"):
+        if sz := def_rpr.get("sz"):
+            return float(sz) / 100.0
+    return None
+
+
+class ShapeData:
+    """Data structure for shape properties extracted from a PowerPoint shape.
+
+    Everything to_dict() needs is read when the record is built, so the shape
+    reference is optional: it may be None (e.g. extract_text_inventory() with
+    keep_shapes=False) without changing the record's data.
+    """
+
+    # Compact records: large inventories hold one per text shape
+    __slots__ = (
+        "shape",
+        "shape_id",
+        "slide_width_emu",
+        "slide_height_emu",
+        "placeholder_type",
+        "default_font_size",
+        "left",
+        "top",
+        "width",
+        "height",
+        "left_emu",
+        "top_emu",
+        "width_emu",
+        "height_emu",
+        "paragraphs",
+        "frame_overflow_bottom",
+        "slide_overflow_right",
+        "slide_overflow_bottom",
+        "overlapping_shapes",
+        "warnings",
+    )
+
+    @staticmethod
+    def emu_to_inches(emu: int) -> float:
+        """Convert EMUs (English Metric Units) to inches."""
+        return emu / 914400.0
+
+    @staticmethod
+    def inches_to_pixels(inches: float, dpi: int = 96) -> int:
+        """Convert inches to pixels at given DPI."""
+        return int(inches * dpi)
+
+    @staticmethod
+    def get_font_path(font_name: str) -> Optional[str]:
+        """Get the font file path for a given font name.
+
+        Args:
+            font_name: Name of the font (e.g., 'Arial', 'Calibri')
+
+        Returns:
+            Path to the font file, or None if not found
+        """
+        return FONT_REGISTRY.find(font_name)
 
     @staticmethod
     def get_slide_dimensions(slide: Any) -> tuple[Optional[int], Optional[int]]:
@@ -374,13 +609,7 @@ class ShapeData:
                 return None
 
             shape_type = shape.placeholder_format.type  # type: ignore
-            for layout_placeholder in slide_layout.placeholders:
-                if layout_placeholder.placeholder_format.type == shape_type:
-                    # Find first defRPr element with sz (size) attribute
-                    for elem in layout_placeholder.element.iter():
-                        if "defRPr" in elem.tag and (sz := elem.get("sz")):
-                            return float(sz) / 100.0  # Convert EMUs to points
-                    break
+            return style_table(slide_layout).layout_font_size(shape_type)
         except Exception:
             pass
         return None
@@ -400,7 +629,7 @@ class ShapeData:
             absolute_top: Absolute top position in EMUs (for shapes in groups)
             slide: Optional slide object to get dimensions and layout information
         """
-        self.shape = shape  # Store reference to original shape
+        self.shape: Optional[BaseShape] = shape  # Reference to original shape
         self.shape_id: str = ""  # Will be set after sorting
 
         # Get slide dimensions from slide object
@@ -424,34 +653,29 @@ class ShapeData:
                     )
 
         # Get position information
-        # Use absolute positions if provided (for shapes in groups), otherwise use shape's position
+        # Use absolute positions if provided (for shapes in groups), otherwise use shape's position.
+        # Each property is read once: placeholders resolve them through their layout
         left_emu = (
-            absolute_left
-            if absolute_left is not None
-            else (shape.left if hasattr(shape, "left") else 0)
-        )
-        top_emu = (
-            absolute_top
-            if absolute_top is not None
-            else (shape.top if hasattr(shape, "top") else 0)
+            absolute_left if absolute_left is not None else getattr(shape, "left", 0)
         )
+        top_emu = absolute_top if absolute_top is not None else getattr(shape, "top", 0)
+        width_emu = getattr(shape, "width", 0)
+        height_emu = getattr(shape, "height", 0)
 
         self.left: float = round(self.emu_to_inches(left_emu), 2)  # type: ignore
         self.top: float = round(self.emu_to_inches(top_emu), 2)  # type: ignore
-        self.width: float = round(
-            self.emu_to_inches(shape.width if hasattr(shape, "width") else 0),
-            2,  # type: ignore
-        )
-        self.height: float = round(
-            self.emu_to_inches(shape.height if hasattr(shape, "height") else 0),
-            2,  # type: ignore
-        )
+        self.width: float = round(self.emu_to_inches(width_emu), 2)  # type: ignore
+        self.height: float = round(self.emu_to_inches(height_emu), 2)  # type: ignore
 
         # Store EMU positions for overflow calculations
         self.left_emu = left_emu
         self.top_emu = top_emu
-        self.width_emu = shape.width if hasattr(shape, "width") else 0
-        self.height_emu = shape.height if hasattr(shape, "height") else 0
+        self.width_emu = width_emu
+        self.height_emu = height_emu
+
+        # Read the paragraphs with text once: (index in the text frame, text, data)
+        text_paragraphs = self._read_paragraphs(shape)
+        self.paragraphs: List[ParagraphData] = [data for _, _, data in text_paragraphs]
 
         # Calculate overflow status
         self.frame_overflow_bottom: Optional[float] = None
@@ -461,20 +685,31 @@ class ShapeData:
             str, float
         ] = {}  # Dict of shape_id -> overlap area in sq inches
         self.warnings: List[str] = []
-        self._estimate_frame_overflow()
+        self._estimate_frame_overflow(text_paragraphs)
         self._calculate_slide_overflow()
         self._detect_bullet_issues()
 
-    @property
-    def paragraphs(self) -> List[ParagraphData]:
-        """Calculate paragraphs from the shape's text frame."""
-        if not self.shape or not hasattr(self.shape, "text_frame"):
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pickle without the shape (for worker processes)."""
+        state = {name: getattr(self, name) for name in self.__slots__}
+        state["shape"] = None
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    @staticmethod
+    def _read_paragraphs(shape: BaseShape) -> List[Tuple[int, str, ParagraphData]]:
+        """Read the paragraphs of a shape's text frame that have text."""
+        if not shape or not hasattr(shape, "text_frame"):
             return []
 
         paragraphs = []
-        for paragraph in self.shape.text_frame.paragraphs:  # type: ignore
-            if paragraph.text.strip():
-                paragraphs.append(ParagraphData(paragraph))
+        for idx, paragraph in enumerate(shape.text_frame.paragraphs):  # type: ignore
+            text = paragraph.text
+            if text.strip():
+                paragraphs.append((idx, text, ParagraphData(paragraph)))
         return paragraphs
 
     def _get_default_font_size(self) -> int:
@@ -485,22 +720,13 @@ class ShapeData:
             ):
                 return 14
 
-            slide_master = self.shape.part.slide_layout.slide_master  # type: ignore
-            if not hasattr(slide_master, "element"):
-                return 14
-
             # Determine theme style based on placeholder type
             style_name = "bodyStyle"  # Default
             if self.placeholder_type and "TITLE" in self.placeholder_type:
                 style_name = "titleStyle"
 
-            # Find font size in theme styles
-            for child in slide_master.element.iter():
-                tag = child.tag.split("}")[-1] if "}" in child.tag else child.tag
-                if tag == style_name:
-                    for elem in child.iter():
-                        if "sz" in elem.attrib:
-                            return int(elem.attrib["sz"]) // 100
+            table = style_table(self.shape.part.slide_layout)  # type: ignore
+            return table.master_font_size(style_name)
         except Exception:
             pass
 
@@ -531,82 +757,82 @@ class ShapeData:
             self.inches_to_pixels(usable_height),
         )
 
-    def _wrap_text_line(self, line: str, max_width_px: int, draw, font) -> List[str]:
-        """Wrap a single line of text to fit within max_width_px."""
+    def _wrap_text_line(
+        self, line: str, max_width_px: int, metrics: FontMetrics
+    ) -> List[str]:
+        """Wrap a single line of text to fit within max_width_px.
+
+        Line widths are summed from cached word and space widths, so wrapping
+        is linear in the length of the line.
+        """
         if not line:
             return [""]
 
-        # Use textlength for efficient width calculation
-        if draw.textlength(line, font=font) <= max_width_px:
+        words = line.split(" ")
+        widths = [metrics.width(word) for word in words]
+        space_width = metrics.space_width
+        if sum(widths) + space_width * (len(words) - 1) <= max_width_px:
             return [line]
 
-        # Need to wrap - split into words
+        # Need to wrap; current_line holds words whose text is not empty
         wrapped = []
-        words = line.split(" ")
-        current_line = ""
+        current_line: List[str] = []
+        current_width = 0.0
 
-        for word in words:
-            test_line = current_line + (" " if current_line else "") + word
-            if draw.textlength(test_line, font=font) <= max_width_px:
-                current_line = test_line
+        for word, width in zip(words, widths):
+            test_width = current_width + space_width + width if current_line else width
+            if test_width <= max_width_px:
+                if current_line:
+                    current_line.append(word)
+                elif word:
+                    current_line = [word]
+                current_width = test_width
             else:
                 if current_line:
-                    wrapped.append(current_line)
-                current_line = word
+                    wrapped.append(" ".join(current_line))
+                current_line = [word] if word else []
+                current_width = width
 
         if current_line:
-            wrapped.append(current_line)
+            wrapped.append(" ".join(current_line))
 
         return wrapped
 
-    def _estimate_frame_overflow(self) -> None:
-        """Estimate if text overflows the shape bounds using PIL text measurement."""
-        if not self.shape or not hasattr(self.shape, "text_frame"):
+    def _estimate_frame_overflow(
+        self, text_paragraphs: List[Tuple[int, str, ParagraphData]]
+    ) -> None:
+        """Estimate if text overflows the shape bounds using PIL text measurement.
+
+        Args:
+            text_paragraphs: (index, text, ParagraphData) of the paragraphs with text
+        """
+        if not text_paragraphs:
             return
 
         text_frame = self.shape.text_frame  # type: ignore
-        if not text_frame or not text_frame.paragraphs:
-            return
 
         # Get usable dimensions after accounting for margins
         usable_width_px, usable_height_px = self._get_usable_dimensions(text_frame)
         if usable_width_px <= 0 or usable_height_px <= 0:
             return
 
-        # Set up PIL for text measurement
-        dummy_img = Image.new("RGB", (1, 1))
-        draw = ImageDraw.Draw(dummy_img)
-
         # Get default font size from placeholder or use conservative estimate
         default_font_size = self._get_default_font_size()
 
         # Calculate total height of all paragraphs
         total_height_px = 0
 
-        for para_idx, paragraph in enumerate(text_frame.paragraphs):
-            if not paragraph.text.strip():
-                continue
-
-            para_data = ParagraphData(paragraph)
-
+        for para_idx, text, para_data in text_paragraphs:
             # Load font for this paragraph
             font_name = para_data.font_name or "Arial"
             font_size = int(para_data.font_size or default_font_size)
 
-            font = None
-            font_path = self.get_font_path(font_name)
-            if font_path:
-                try:
-                    font = ImageFont.truetype(font_path, size=font_size)
-                except Exception:
-                    font = ImageFont.load_default()
-            else:
-                font = ImageFont.load_default()
+            metrics = FONT_REGISTRY.metrics_for(font_name, font_size)
 
             # Wrap all lines in this paragraph
             all_wrapped_lines = []
-            for line in paragraph.text.split("\n"):
-                wrapped = self._wrap_text_line(line, usable_width_px, draw, font)
+            for line in text.split("\n"):
+                wrapped = self._wrap_text_line(line, usable_width_px, metrics)
                 all_wrapped_lines.extend(wrapped)
 
             if all_wrapped_lines:
@@ -659,18 +885,11 @@ class ShapeData:
 
     def _detect_bullet_issues(self) -> None:
         """Detect bullet point formatting issues in paragraphs."""
-        if not self.shape or not hasattr(self.shape, "text_frame"):
-            return
-
-        text_frame = self.shape.text_frame  # type: ignore
-        if not text_frame or not text_frame.paragraphs:
-            return
-
         # Common bullet symbols that indicate manual bullets
         bullet_symbols = ["•", "●", "○"]
 
-        for paragraph in text_frame.paragraphs:
-            text = paragraph.text.strip()
+        for paragraph in self.paragraphs:
+            text = paragraph.text
             # Check for manual bullet symbols
             if text and any(text.startswith(symbol + " ") for symbol in bullet_symbols):
                 self.warnings.append(
@@ -783,8 +1002,8 @@ def collect_shapes_with_absolute_positions(
     if hasattr(shape, "shapes"):  # GroupShape
         result = []
         # Get this group's position
-        group_left = shape.left if hasattr(shape, "left") else 0
-        group_top = shape.top if hasattr(shape, "top") else 0
+        group_left = getattr(shape, "left", 0)
+        group_top = getattr(shape, "top", 0)
 
         # Calculate absolute position for this group
         abs_group_left = parent_left + group_left
@@ -802,8 +1021,8 @@ def collect_shapes_with_absolute_positions(
     # Regular shape - check if it has valid text
     if is_valid_shape(shape):
         # Calculate absolute position
-        shape_left = shape.left if hasattr(shape, "left") else 0
-        shape_top = shape.top if hasattr(shape, "top") else 0
+        shape_left = getattr(shape, "left", 0)
+        shape_top = getattr(shape, "top", 0)
 
         return [
             ShapeWithPosition(
@@ -879,40 +1098,212 @@ def calculate_overlap(
     return False, 0
 
 
-def detect_overlaps(shapes: List[ShapeData]) -> None:
+def detect_overlaps(
+    shapes: List[ShapeData], use_numpy: Optional[bool] = None
+) -> None:
     """Detect overlapping shapes and update their overlapping_shapes dictionaries.
 
     This function requires each ShapeData to have its shape_id already set.
     It modifies the shapes in-place, adding shape IDs with overlap areas in square inches.
 
+    Only pairs whose bounding boxes share a cell of a uniform grid are passed
+    to calculate_overlap, or, with NumPy, each shape is checked against all
+    later ones at once. Either way the results, and the order of each
+    overlapping_shapes dictionary, are the same as comparing every pair.
+
     Args:
         shapes: List of ShapeData objects with shape_id attributes set
+        use_numpy: Vectorize the check with NumPy; by default only for slides
+            with at least NUMPY_OVERLAP_MIN_SHAPES shapes, when NumPy is installed
     """
     n = len(shapes)
+    if n < 2:
+        return
+
+    # Ensure shape IDs are set
+    for i, shape in enumerate(shapes):
+        assert shape.shape_id, f"Shape at index {i} has no shape_id"
+
+    rects = [(shape.left, shape.top, shape.width, shape.height) for shape in shapes]
+
+    if use_numpy is None:
+        use_numpy = np is not None and n >= NUMPY_OVERLAP_MIN_SHAPES
+    if use_numpy:
+        overlaps = _find_overlaps_numpy(rects)
+    else:
+        overlaps = []
+        for i, j in sorted(_overlap_candidates(rects)):
+            overlapping, overlap_area = calculate_overlap(rects[i], rects[j])
+            if overlapping:
+                overlaps.append((i, j, overlap_area))
+
+    # Apply pairs in (i, j) order, as comparing every pair would
+    for i, j, overlap_area in overlaps:
+        # Add shape IDs with overlap area in square inches
+        shapes[i].overlapping_shapes[shapes[j].shape_id] = overlap_area
+        shapes[j].overlapping_shapes[shapes[i].shape_id] = overlap_area
+
+
+def _overlap_candidates(
+    rects: List[Tuple[float, float, float, float]],
+) -> set:
+    """Return the index pairs (i, j), i < j, of rectangles that may overlap.
+
+    Rectangles are bucketed into a uniform grid with cells about the size of
+    the median rectangle; two rectangles can only overlap if they share a
+    cell. The bounds are computed exactly like calculate_overlap computes
+    them, so no overlapping pair is ever missed.
+    """
+    bounds = []
+    for left, top, width, height in rects:
+        right, bottom = left + width, top + height
+        bounds.append(
+            (min(left, right), min(top, bottom), max(left, right), max(top, bottom))
+        )
+
+    sizes = sorted(max(x1 - x0, y1 - y0) for x0, y0, x1, y1 in bounds)
+    cell_size = max(sizes[len(sizes) // 2], 0.1)
+
+    # Rectangles spanning more cells than there are rectangles (e.g. slide
+    # backgrounds) are paired with everything instead of filling the grid
+    max_cells = max(len(bounds), 16)
+    grid: Dict[Tuple[int, int], List[int]] = {}
+    large = []
+    for index, (x0, y0, x1, y1) in enumerate(bounds):
+        columns = range(int(x0 // cell_size), int(x1 // cell_size) + 1)
+        rows = range(int(y0 // cell_size), int(y1 // cell_size) + 1)
+        if len(columns) * len(rows) > max_cells:
+            large.append(index)
+            continue
+        for cx in columns:
+            for cy in rows:
+                grid.setdefault((cx, cy), []).append(index)
+
+    candidates = set()
+    for index in large:
+        for other in range(len(bounds)):
+            if other != index:
+                candidates.add((min(index, other), max(index, other)))
+    for members in grid.values():
+        for a in range(len(members)):
+            for b in range(a + 1, len(members)):
+                candidates.add((members[a], members[b]))
+    return candidates
+
+
+def _find_overlaps_numpy(
+    rects: List[Tuple[float, float, float, float]], tolerance: float = 0.05
+) -> List[Tuple[int, int, float]]:
+    """Vectorized calculate_overlap over all pairs: (i, j, area) in (i, j) order."""
+    if np is None:
+        raise ImportError("NumPy is not installed. Install with: pip install numpy")
+
+    lefts, tops, widths, heights = (
+        np.array(column, dtype=float) for column in zip(*rects)
+    )
+    rights = lefts + widths
+    bottoms = tops + heights
+
+    overlaps = []
+    for i in range(len(rects) - 1):
+        overlap_width = np.minimum(rights[i], rights[i + 1 :]) - np.maximum(
+            lefts[i], lefts[i + 1 :]
+        )
+        overlap_height = np.minimum(bottoms[i], bottoms[i + 1 :]) - np.maximum(
+            tops[i], tops[i + 1 :]
+        )
+        hits = np.flatnonzero(
+            (overlap_width > tolerance) & (overlap_height > tolerance)
+        )
+        for k in hits.tolist():
+            overlap_area = float(overlap_width[k]) * float(overlap_height[k])
+            overlaps.append((i, i + 1 + k, round(overlap_area, 2)))
+    return overlaps
+
 
-    # Compare each pair of shapes
-    for i in range(n):
-        for j in range(i + 1, n):
-            shape1 = shapes[i]
-            shape2 = shapes[j]
+# Presentation owned by a process-pool worker; each worker loads the file once
+# and keeps its own font and style caches for the lifetime of the pool.
+_worker_presentation = None
 
-            # Ensure shape IDs are set
-            assert shape1.shape_id, f"Shape at index {i} has no shape_id"
-            assert shape2.shape_id, f"Shape at index {j} has no shape_id"
 
-            rect1 = (shape1.left, shape1.top, shape1.width, shape1.height)
-            rect2 = (shape2.left, shape2.top, shape2.width, shape2.height)
+def _init_inventory_worker(pptx_path: Path) -> None:
+    """Load the presentation used by this worker process."""
+    global _worker_presentation
+    _worker_presentation = Presentation(str(pptx_path))
 
-            overlaps, overlap_area = calculate_overlap(rect1, rect2)
 
-            if overlaps:
-                # Add shape IDs with overlap area in square inches
-                shape1.overlapping_shapes[shape2.shape_id] = overlap_area
-                shape2.overlapping_shapes[shape1.shape_id] = overlap_area
+def _extract_slide_inventory_in_worker(
+    slide_idx: int, issues_only: bool
+) -> Optional[Dict[str, ShapeData]]:
+    """Extract the inventory of one slide inside a worker process."""
+    slide = _worker_presentation.slides[slide_idx]  # type: ignore
+    # Shapes cannot be sent back to the parent process
+    return extract_slide_inventory(slide, issues_only, keep_shapes=False)
+
+
+def extract_slide_inventory(
+    slide: Any, issues_only: bool = False, keep_shapes: bool = True
+) -> Optional[Dict[str, ShapeData]]:
+    """Extract text content from one slide.
+
+    Args:
+        slide: Slide object
+        issues_only: If True, only include shapes that have overflow or overlap issues
+        keep_shapes: If False, ShapeData.shape is None, so the records do not
+            keep the slide's XML alive
+
+    Returns a dictionary {shape-N: ShapeData} of the slide's shapes sorted by
+    visual position, or None if the slide has no (matching) text shapes.
+    """
+    # Collect all valid shapes from this slide with absolute positions
+    shapes_with_positions = []
+    for shape in slide.shapes:  # type: ignore
+        shapes_with_positions.extend(collect_shapes_with_absolute_positions(shape))
+
+    if not shapes_with_positions:
+        return None
+
+    # Convert to ShapeData with absolute positions and slide reference
+    shape_data_list = [
+        ShapeData(
+            swp.shape,
+            swp.absolute_left,
+            swp.absolute_top,
+            slide,
+        )
+        for swp in shapes_with_positions
+    ]
+
+    # Sort by visual position and assign stable IDs in one step
+    sorted_shapes = sort_shapes_by_position(shape_data_list)
+    for idx, shape_data in enumerate(sorted_shapes):
+        shape_data.shape_id = f"shape-{idx}"
+
+    # Detect overlaps using the stable shape IDs
+    if len(sorted_shapes) > 1:
+        detect_overlaps(sorted_shapes)
+
+    # Filter for issues only if requested (after overlap detection)
+    if issues_only:
+        sorted_shapes = [sd for sd in sorted_shapes if sd.has_any_issues]
+
+    if not sorted_shapes:
+        return None
+
+    if not keep_shapes:
+        for shape_data in sorted_shapes:
+            shape_data.shape = None
+
+    # Create slide inventory using the stable shape IDs
+    return {shape_data.shape_id: shape_data for shape_data in sorted_shapes}
 
 
 def extract_text_inventory(
-    pptx_path: Path, prs: Optional[Any] = None, issues_only: bool = False
+    pptx_path: Path,
+    prs: Optional[Any] = None,
+    issues_only: bool = False,
+    jobs: int = 1,
+    keep_shapes: bool = True,
 ) -> InventoryData:
     """Extract text content from all slides in a PowerPoint presentation.
 
@@ -920,61 +1311,56 @@ def extract_text_inventory(
         pptx_path: Path to the PowerPoint file
         prs: Optional Presentation object to use. If not provided, will load from pptx_path.
         issues_only: If True, only include shapes that have overflow or overlap issues
+        jobs: Worker processes to extract slides with (0 = one per CPU). Only
+            used when prs is not provided, since each worker loads pptx_path
+        keep_shapes: If False, ShapeData.shape is None and the inventory does
+            not keep the presentation alive (use it when only the data is needed)
 
     Returns a nested dictionary: {slide-N: {shape-N: ShapeData}}
     Shapes are sorted by visual position (top-to-bottom, left-to-right).
     The ShapeData objects contain the full shape information and can be
     converted to dictionaries for JSON serialization using to_dict().
+    ShapeData extracted by worker processes have no shape reference either.
     """
+    jobs = jobs or os.cpu_count() or 1
+    parallel = prs is None and jobs > 1
     if prs is None:
         prs = Presentation(str(pptx_path))
-    inventory: InventoryData = {}
-
-    for slide_idx, slide in enumerate(prs.slides):
-        # Collect all valid shapes from this slide with absolute positions
-        shapes_with_positions = []
-        for shape in slide.shapes:  # type: ignore
-            shapes_with_positions.extend(collect_shapes_with_absolute_positions(shape))
-
-        if not shapes_with_positions:
-            continue
+    slide_count = len(prs.slides)
 
-        # Convert to ShapeData with absolute positions and slide reference
-        shape_data_list = [
-            ShapeData(
-                swp.shape,
-                swp.absolute_left,
-                swp.absolute_top,
-                slide,
+    if not parallel or slide_count <= 1:
+        slide_inventories = (
+            extract_slide_inventory(slide, issues_only, keep_shapes)
+            for slide in prs.slides
+        )
+    else:
+        workers = min(jobs, slide_count)
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_inventory_worker,
+            initargs=(pptx_path,),
+        ) as executor:
+            # map() yields in slide order, so the merge is deterministic
+            slide_inventories = list(
+                executor.map(
+                    _extract_slide_inventory_in_worker,
+                    range(slide_count),
+                    [issues_only] * slide_count,
+                    chunksize=max(1, slide_count // (workers * 4)),
+                )
             )
-            for swp in shapes_with_positions
-        ]
-
-        # Sort by visual position and assign stable IDs in one step
-        sorted_shapes = sort_shapes_by_position(shape_data_list)
-        for idx, shape_data in enumerate(sorted_shapes):
-            shape_data.shape_id = f"shape-{idx}"
-
-        # Detect overlaps using the stable shape IDs
-        if len(sorted_shapes) > 1:
-            detect_overlaps(sorted_shapes)
-
-        # Filter for issues only if requested (after overlap detection)
-        if issues_only:
-            sorted_shapes = [sd for sd in sorted_shapes if sd.has_any_issues]
 
-        if not sorted_shapes:
-            continue
-
-        # Create slide inventory using the stable shape IDs
-        inventory[f"slide-{slide_idx}"] = {
-            shape_data.shape_id: shape_data for shape_data in sorted_shapes
-        }
+    inventory: InventoryData = {}
+    for slide_idx, slide_inventory in enumerate(slide_inventories):
+        if slide_inventory:
+            inventory[f"slide-{slide_idx}"] = slide_inventory
 
     return inventory
 
 
-def get_inventory_as_dict(pptx_path: Path, issues_only: bool = False) -> InventoryDict:
+def get_inventory_as_dict(
+    pptx_path: Path, issues_only: bool = False, jobs: int = 1
+) -> InventoryDict:
     """Extract text inventory and return as JSON-serializable dictionaries.
 
     This is a convenience wrapper around extract_text_inventory that returns
@@ -984,11 +1370,15 @@ def get_inventory_as_dict(pptx_path: Path, issues_only: bool = False) -> Invento
     Args:
         pptx_path: Path to the PowerPoint file
         issues_only: If True, only include shapes that have overflow or overlap issues
+        jobs: Worker processes to extract slides with (0 = one per CPU)
 
     Returns:
         Nested dictionary with all data serialized for JSON
     """
-    inventory = extract_text_inventory(pptx_path, issues_only=issues_only)
+    # Only the data is needed, so the presentation can be freed once read
+    inventory = extract_text_inventory(
+        pptx_path, issues_only=issues_only, jobs=jobs, keep_shapes=False
+    )
 
     # Convert ShapeData objects to dictionaries
     dict_inventory: InventoryDict = {}
@@ -50,6 +50,10 @@ from inventory import extract_text_inventory
 from PIL import Image, ImageDraw, ImageFont
 from pptx import Presentation
 
+# The soffice pool is shared with the vendored ooxml scripts of this skill
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from ooxml.scripts.soffice_pool import PoolUnavailable, get_pool  # noqa: E402
+
 # Constants
 THUMBNAIL_WIDTH = 300  # Fixed thumbnail width in pixels
 CONVERSION_DPI = 100  # DPI for PDF to image conversion
@@ -216,20 +220,8 @@ def convert_to_images(pptx_path, temp_dir, dpi):
 
     # Convert to PDF
     print("Converting to PDF...")
-    result = subprocess.run(
-        [
-            "soffice",
-            "--headless",
-            "--convert-to",
-            "pdf",
-            "--outdir",
-            str(temp_dir),
-            str(pptx_path),
-        ],
-        capture_output=True,
-        text=True,
-    )
-    if result.returncode != 0 or not pdf_path.exists():
+    convert_to_pdf(pptx_path, temp_dir)
+    if not pdf_path.exists():
         raise RuntimeError("PDF conversion failed")
 
     # Convert PDF to images
@@ -271,6 +263,43 @@ def convert_to_images(pptx_path, temp_dir, dpi):
     return all_images
 
 
+def convert_to_pdf(pptx_path, temp_dir):
+    """Convert to PDF on the shared soffice pool, or with a one-shot soffice.
+
+    The pool is only used when enabled (see soffice_pool); anything it fails
+    to convert is retried with a one-shot soffice.
+    """
+    pool = get_pool()
+    if pool is not None:
+        try:
+            pool.convert(pptx_path, temp_dir, "pdf")
+            return
+        except PoolUnavailable:
+            pass  # Fall back to a one-shot soffice below
+        except Exception as e:
+            print(
+                f"Warning: soffice pool conversion failed ({e}), "
+                "retrying with a one-shot soffice",
+                file=sys.stderr,
+            )
+
+    result = subprocess.run(
+        [
+            "soffice",
+            "--headless",
+            "--convert-to",
+            "pdf",
+            "--outdir",
+            str(temp_dir),
+            str(pptx_path),
+        ],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError("PDF conversion failed")
+
+
 def create_grids(
     image_paths,
     cols,
@@ -1,16 +1,29 @@
 #!/usr/bin/env python3
 """
 Excel Formula Recalculation Script
-Recalculates all formulas in an Excel file using LibreOffice
+Recalculates all formulas in an Excel file, in-process when every formula is
+supported by formula_engine.py and using LibreOffice otherwise
 """
 
+import argparse
 import json
 import sys
 import subprocess
 import os
 import platform
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from openpyxl import load_workbook
+from xml.parsers import expat
+from openpyxl.utils.cell import column_index_from_string, coordinate_from_string, get_column_letter
+from formula_engine import (
+    UnsupportedFormula, calculate_incremental, calculate_workbook, format_cell, local_name, workbook_sheets
+)
+from soffice_pool import PoolUnavailable, get_pool
+
+EXCEL_ERRORS = ['#VALUE!', '#DIV/0!', '#REF!', '#NAME?', '#NULL!', '#NUM!', '#N/A']
+# 'auto' uses the in-process engine when it supports every formula
+ENGINES = ['auto', 'python', 'libreoffice']
 
 
 def setup_libreoffice_macro():
@@ -50,22 +63,13 @@ def setup_libreoffice_macro():
         return False
 
 
-def recalc(filename, timeout=30):
+def recalc_with_macro(abs_path, timeout):
     """
-    Recalculate formulas in Excel file and report any errors
-    
-    Args:
-        filename: Path to Excel file
-        timeout: Maximum time to wait for recalculation (seconds)
+    Recalculate formulas by running the RecalculateAndSave macro in a one-shot soffice
     
     Returns:
-        dict with error locations and counts
+        dict with an error message, or None on success
     """
-    if not Path(filename).exists():
-        return {'error': f'File {filename} does not exist'}
-    
-    abs_path = str(Path(filename).absolute())
-    
     if not setup_libreoffice_macro():
         return {'error': 'Failed to setup LibreOffice macro'}
     
@@ -98,81 +102,439 @@ def recalc(filename, timeout=30):
         else:
             return {'error': error_msg}
     
+    return None
+
+
+def recalc(filename, timeout=30, engine='auto'):
+    """
+    Recalculate formulas in Excel file and report any errors
+    
+    Args:
+        filename: Path to Excel file
+        timeout: Maximum time to wait for recalculation (seconds)
+        engine: 'python' for the in-process formula engine, 'libreoffice',
+            or 'auto' to use the engine and fall back to LibreOffice when a
+            formula is not supported
+    
+    Returns:
+        dict with error locations and counts, and the engine that was used
+    """
+    if not Path(filename).exists():
+        return {'error': f'File {filename} does not exist'}
+    if engine not in ENGINES:
+        return {'error': f'Unknown engine {engine}; expected one of {", ".join(ENGINES)}'}
+    
+    abs_path = str(Path(filename).absolute())
+    
+    if engine != 'libreoffice':
+        try:
+            calculate_workbook(abs_path)
+            return dict(scan_workbook(filename), engine='python')
+        except UnsupportedFormula as e:
+            if engine == 'python':
+                return {'error': f'Unsupported by the formula engine: {e}'}
+        except Exception as e:
+            # Nothing is written unless every formula evaluated
+            if engine == 'python':
+                return {'error': str(e)}
+    
+    error = recalc_with_libreoffice(abs_path, timeout)
+    if error:
+        return error
+    
     # Check for Excel errors in the recalculated file - scan ALL cells
     try:
-        wb = load_workbook(filename, data_only=True)
-        
-        excel_errors = ['#VALUE!', '#DIV/0!', '#REF!', '#NAME?', '#NULL!', '#NUM!', '#N/A']
-        error_details = {err: [] for err in excel_errors}
-        total_errors = 0
-        
-        for sheet_name in wb.sheetnames:
-            ws = wb[sheet_name]
-            # Check ALL rows and columns - no limits
-            for row in ws.iter_rows():
-                for cell in row:
-                    if cell.value is not None and isinstance(cell.value, str):
-                        for err in excel_errors:
-                            if err in cell.value:
-                                location = f"{sheet_name}!{cell.coordinate}"
-                                error_details[err].append(location)
-                                total_errors += 1
-                                break
-        
-        wb.close()
-        
-        # Build result summary
-        result = {
-            'status': 'success' if total_errors == 0 else 'errors_found',
-            'total_errors': total_errors,
-            'error_summary': {}
-        }
-        
-        # Add non-empty error categories
-        for err_type, locations in error_details.items():
-            if locations:
-                result['error_summary'][err_type] = {
-                    'count': len(locations),
-                    'locations': locations[:20]  # Show up to 20 locations
-                }
-        
-        # Add formula count for context - also check ALL cells
-        wb_formulas = load_workbook(filename, data_only=False)
-        formula_count = 0
-        for sheet_name in wb_formulas.sheetnames:
-            ws = wb_formulas[sheet_name]
-            for row in ws.iter_rows():
-                for cell in row:
-                    if cell.value and isinstance(cell.value, str) and cell.value.startswith('='):
-                        formula_count += 1
-        wb_formulas.close()
-        
-        result['total_formulas'] = formula_count
-        
-        return result
-        
+        return dict(scan_workbook(filename), engine='libreoffice')
     except Exception as e:
         return {'error': str(e)}
 
 
+def recalc_incremental(filename, changed_cells=None, timeout=30):
+    """
+    Recalculate only the formulas affected by edits since the last incremental run
+    
+    The formula graph and values are cached in a hidden sidecar file next to
+    the workbook (.<name>.formulas), keyed by the workbook's hash. Errors are
+    only reported for cells whose value changed; the first run, or a run
+    without a usable cache, recalculates and reports everything.
+    
+    Workbooks the in-process engine cannot evaluate get a full LibreOffice
+    recalculation instead.
+    
+    Args:
+        filename: Path to Excel file
+        changed_cells: References of edited cells, e.g. ['Inputs!B7', 'C2:C9'];
+            default: detect edits by diffing against the cache
+        timeout: Maximum time to wait for a LibreOffice fallback (seconds)
+    
+    Returns:
+        dict like recalc(), with 'mode' ('incremental', 'unchanged' or
+        'full'), 'recalculated' and 'changed_cells' counts
+    """
+    if not Path(filename).exists():
+        return {'error': f'File {filename} does not exist'}
+    
+    try:
+        update = calculate_incremental(filename, changed_cells)
+    except UnsupportedFormula:
+        return dict(recalc(filename, timeout, engine='libreoffice'), mode='full')
+    except ValueError as e:
+        return {'error': str(e)}
+    
+    if update['changed'] is None:
+        try:
+            return dict(scan_workbook(filename), engine='python', mode='full')
+        except Exception as e:
+            return {'error': str(e)}
+    
+    error_details = {err: [] for err in EXCEL_ERRORS}
+    for cell, value in update['changed'].items():
+        err = find_excel_error(value) if isinstance(value, str) else None
+        if err:
+            error_details[err].append(format_cell(cell))
+    total_errors = sum(len(locations) for locations in error_details.values())
+    
+    result = {
+        'status': 'success' if total_errors == 0 else 'errors_found',
+        'total_errors': total_errors,
+        'error_summary': {}
+    }
+    for err_type, locations in error_details.items():
+        if locations:
+            result['error_summary'][err_type] = {
+                'count': len(locations),
+                'locations': sorted(locations)[:20]
+            }
+    result['total_formulas'] = update['total_formulas']
+    result['recalculated'] = update['evaluated']
+    result['changed_cells'] = len(update['changed'])
+    result['engine'] = 'python'
+    result['mode'] = update['mode']
+    return result
+
+
+def recalc_with_libreoffice(abs_path, timeout):
+    """
+    Recalculate formulas with LibreOffice, preferring the soffice pool
+    
+    Returns:
+        dict with an error message, or None on success
+    """
+    # Prefer the soffice pool when it is enabled; anything it fails to do is
+    # retried with a one-shot macro run
+    pool = get_pool()
+    if pool is not None:
+        try:
+            pool.recalculate(abs_path, timeout=timeout)
+            return None
+        except PoolUnavailable:
+            pass
+        except Exception as e:
+            print(f"Warning: soffice pool recalculation failed ({e}), retrying with a one-shot soffice", file=sys.stderr)
+    
+    return recalc_with_macro(abs_path, timeout)
+
+
+def scan_workbook(filename):
+    """
+    Count formulas and Excel errors in every cell of every worksheet
+    
+    Makes a single streaming pass over the raw worksheet XML, reading each
+    cell's <f> element and cached value together. Memory use does not grow
+    with workbook size: only the indices of shared strings that contain an
+    error are kept.
+    
+    Args:
+        filename: Path to Excel file
+    
+    Returns:
+        dict with status, total_errors, total_formulas, error_summary and a
+        per-sheet breakdown under 'sheets'
+    """
+    error_details = {err: [] for err in EXCEL_ERRORS}
+    total_errors = 0
+    formula_count = 0
+    sheets = {}
+    
+    with zipfile.ZipFile(filename) as zf:
+        shared_string_errors = scan_shared_strings(zf)
+        for sheet_name, part_name in workbook_sheets(zf):
+            scanner = SheetScanner(sheet_name, shared_string_errors)
+            with zf.open(part_name) as f:
+                scanner.feed(f)
+            
+            sheet_errors = {}
+            for err, location in scanner.errors:
+                error_details[err].append(location)
+                sheet_errors[err] = sheet_errors.get(err, 0) + 1
+            total_errors += len(scanner.errors)
+            formula_count += scanner.formula_count
+            sheets[sheet_name] = {
+                'total_errors': len(scanner.errors),
+                'total_formulas': scanner.formula_count,
+                'error_summary': sheet_errors
+            }
+    
+    # Build result summary
+    result = {
+        'status': 'success' if total_errors == 0 else 'errors_found',
+        'total_errors': total_errors,
+        'error_summary': {}
+    }
+    
+    # Add non-empty error categories
+    for err_type, locations in error_details.items():
+        if locations:
+            result['error_summary'][err_type] = {
+                'count': len(locations),
+                'locations': locations[:20]  # Show up to 20 locations
+            }
+    
+    result['total_formulas'] = formula_count
+    result['sheets'] = sheets
+    
+    return result
+
+
+def find_excel_error(value):
+    """Return the first Excel error string contained in value, or None"""
+    if '#' not in value:
+        return None
+    for err in EXCEL_ERRORS:
+        if err in value:
+            return err
+    return None
+
+
+def scan_shared_strings(zf):
+    """Return {shared string index: Excel error it contains} for the shared string table"""
+    if 'xl/sharedStrings.xml' not in zf.namelist():
+        return {}
+    
+    errors = {}
+    state = {'index': -1, 'parts': [], 'text': None, 'in_phonetic': False}
+    
+    def start(name, attrs):
+        name = local_name(name)
+        if name == 'si':
+            state['index'] += 1
+            state['parts'] = []
+        elif name == 'rPh':
+            state['in_phonetic'] = True
+        elif name == 't' and not state['in_phonetic']:
+            state['text'] = []
+    
+    def end(name):
+        name = local_name(name)
+        if name == 't' and state['text'] is not None:
+            state['parts'].append(''.join(state['text']))
+            state['text'] = None
+        elif name == 'rPh':
+            state['in_phonetic'] = False
+        elif name == 'si':
+            err = find_excel_error(''.join(state['parts']))
+            if err:
+                errors[state['index']] = err
+    
+    def chars(data):
+        if state['text'] is not None:
+            state['text'].append(data)
+    
+    parser = expat.ParserCreate()
+    parser.StartElementHandler = start
+    parser.EndElementHandler = end
+    parser.CharacterDataHandler = chars
+    with zf.open('xl/sharedStrings.xml') as f:
+        parser.ParseFile(f)
+    return errors
+
+
+class SheetScanner:
+    """
+    Streaming scanner for one worksheet part
+    
+    Collects (error, location) pairs for cells whose cached value contains an
+    Excel error, in the same row-major order openpyxl visits them, and counts
+    cells that have a formula.
+    """
+    
+    def __init__(self, sheet_name, shared_string_errors):
+        self.sheet_name = sheet_name
+        self.shared_string_errors = shared_string_errors
+        self.errors = []
+        self.formula_count = 0
+        
+        self._row = 0
+        self._column = 0
+        self._ref = None
+        self._type = None
+        self._has_formula = False
+        self._text = None
+        self._value = []
+        self._in_phonetic = False
+        
+        self._parser = expat.ParserCreate()
+        self._parser.buffer_text = True
+        self._parser.StartElementHandler = self._start
+        self._parser.EndElementHandler = self._end
+        self._parser.CharacterDataHandler = self._chars
+    
+    def feed(self, f):
+        self._parser.ParseFile(f)
+    
+    def _start(self, name, attrs):
+        name = local_name(name)
+        if name == 'c':
+            ref = attrs.get('r')
+            if ref:
+                self._column = None
+            else:
+                # Cells may omit r; they then follow the previous cell
+                if self._column is None:
+                    column, _ = coordinate_from_string(self._ref)
+                    self._column = column_index_from_string(column)
+                self._column += 1
+                ref = f"{get_column_letter(self._column)}{self._row}"
+            self._ref = ref
+            self._type = attrs.get('t', 'n')
+            self._has_formula = False
+            self._value = []
+        elif name == 'row':
+            self._row = int(attrs['r']) if 'r' in attrs else self._row + 1
+            self._column = 0
+        elif name == 'f':
+            self._has_formula = True
+        elif name == 'v' or (name == 't' and not self._in_phonetic):
+            self._text = self._value
+        elif name == 'rPh':
+            self._in_phonetic = True
+    
+    def _end(self, name):
+        name = local_name(name)
+        if name == 'c':
+            if self._has_formula:
+                self.formula_count += 1
+            err = self._cell_error()
+            if err:
+                self.errors.append((err, f"{self.sheet_name}!{self._ref}"))
+        elif name in ('v', 't'):
+            self._text = None
+        elif name == 'rPh':
+            self._in_phonetic = False
+    
+    def _chars(self, data):
+        if self._text is not None:
+            self._text.append(data)
+    
+    def _cell_error(self):
+        if not self._value:
+            return None
+        value = ''.join(self._value)
+        if self._type == 's':
+            return self.shared_string_errors.get(int(value))
+        if self._type in ('e', 'str', 'inlineStr'):
+            return find_excel_error(value)
+        return None
+
+
+def recalc_many(paths, jobs=1, timeout=30, engine='auto'):
+    """
+    Recalculate many Excel files within one LibreOffice session
+    
+    When the soffice pool is enabled (SOFFICE_POOL_SIZE), it is started with
+    `jobs` workers and kept for the whole batch, so LibreOffice starts once
+    rather than once per file. Otherwise files are recalculated one at a
+    time with the one-shot macro, since parallel one-shot soffice runs share
+    a profile.
+    
+    Args:
+        paths: Paths to Excel files
+        jobs: Number of workbooks to recalculate in parallel
+        timeout: Maximum time to wait for each recalculation (seconds)
+        engine: Formula engine passed to recalc()
+    
+    Yields:
+        (path, result) tuples in input order, result as returned by recalc()
+    """
+    paths = list(paths)
+    # The in-process engine holds the GIL, so threads would not help it
+    if engine == 'python' or get_pool(size=jobs) is None:
+        jobs = 1
+    
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        results = executor.map(lambda path: recalc(path, timeout, engine), paths)
+        yield from zip(paths, results)
+
+
+def main_batch(argv):
+    parser = argparse.ArgumentParser(
+        prog='recalc.py --batch',
+        description='Recalculate many Excel files and print one JSON line per file',
+    )
+    parser.add_argument('files', nargs='*', help='Excel files (read from stdin, one per line, if omitted)')
+    parser.add_argument('--jobs', '-j', type=int, default=1, help='Workbooks to recalculate in parallel (default: 1)')
+    parser.add_argument('--timeout', type=int, default=30, help='Timeout per workbook in seconds (default: 30)')
+    parser.add_argument('--engine', choices=ENGINES, default='auto', help='Formula engine (default: auto)')
+    args = parser.parse_args(argv)
+    
+    files = args.files or [line.strip() for line in sys.stdin if line.strip()]
+    failed = False
+    for path, result in recalc_many(files, jobs=args.jobs, timeout=args.timeout, engine=args.engine):
+        failed = failed or 'error' in result
+        print(json.dumps({'file': path, **result}), flush=True)
+    sys.exit(1 if failed else 0)
+
+
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python recalc.py <excel_file> [timeout_seconds]")
-        print("\nRecalculates all formulas in an Excel file using LibreOffice")
+    if len(sys.argv) > 1 and sys.argv[1] == '--batch':
+        main_batch(sys.argv[2:])
+        return
+    
+    args = sys.argv[1:]
+    engine = pop_option(args, '--engine', 'auto')
+    changed = pop_option(args, '--changed')
+    incremental = '--incremental' in args or changed is not None
+    if '--incremental' in args:
+        args.remove('--incremental')
+    
+    if len(args) < 1:
+        print("Usage: python recalc.py <excel_file> [timeout_seconds] [--engine auto|python|libreoffice]")
+        print("       python recalc.py <excel_file> --incremental [--changed Sheet1!B2,Sheet1!C3:C9]")
+        print("       python recalc.py --batch [--jobs N] [--timeout S] [--engine E] [excel_file ...]")
+        print("\nRecalculates all formulas in an Excel file, in-process when possible, otherwise using LibreOffice")
         print("\nReturns JSON with error details:")
         print("  - status: 'success' or 'errors_found'")
         print("  - total_errors: Total number of Excel errors found")
         print("  - total_formulas: Number of formulas in the file")
         print("  - error_summary: Breakdown by error type with locations")
         print("    - #VALUE!, #DIV/0!, #REF!, #NAME?, #NULL!, #NUM!, #N/A")
+        print("  - engine: 'python' or 'libreoffice'")
+        print("\nWith --incremental, only formulas affected by edits since the last")
+        print("incremental run are recalculated, and only errors in cells whose value")
+        print("changed are reported")
+        print("\nWith --batch, prints one JSON object per line, each with a 'file' key")
         sys.exit(1)
     
-    filename = sys.argv[1]
-    timeout = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    filename = args[0]
+    timeout = int(args[1]) if len(args) > 1 else 30
     
-    result = recalc(filename, timeout)
+    if incremental:
+        cells = [ref for ref in changed.split(',') if ref.strip()] if changed else None
+        result = recalc_incremental(filename, cells, timeout)
+    else:
+        result = recalc(filename, timeout, engine)
     print(json.dumps(result, indent=2))
 
 
+def pop_option(args, name, default=None):
+    """Remove '<name> <value>' from args and return the value"""
+    if name not in args:
+        return default
+    index = args.index(name)
+    value = args[index + 1] if index + 1 < len(args) else ''
+    del args[index:index + 2]
+    return value
+
+
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -0,0 +1,418 @@
+"""
+Long-lived LibreOffice workers shared by validation, recalculation and thumbnails.
+
+Cold-starting `soffice --headless` costs several seconds per call. A pool
+keeps headless soffice processes running, each listening on a local UNO
+socket, and runs conversion and recalculation jobs on them through a bounded
+queue. Each worker is health-checked before every job and restarted if its
+process died or stopped answering; a job that times out kills its worker,
+which is then restarted for the next job.
+
+The pool is off by default: set SOFFICE_POOL_SIZE to enable it. It also
+needs the UNO Python bridge (the `uno` module shipped with LibreOffice, or
+the python3-uno package). When the pool is disabled, the bridge is missing
+or soffice cannot be started, get_pool() returns None and callers run
+soffice once per call. Callers also fall back to a one-shot soffice when a
+pool job fails for any reason.
+
+The pool lives only as long as the Python process that started it and is
+shut down at exit. Separate command-line runs (one `pack.py --validate` or
+`thumbnail.py` per document, one `recalc.py` per workbook) each start
+soffice again; only work done within one process, such as
+`recalc.py --batch`, shares the running workers.
+
+Environment:
+    SOFFICE_POOL_SIZE: Number of soffice workers (default: 0, the pool is off)
+
+This file is shared by several skills; keep the copies in sync.
+"""
+
+import atexit
+import os
+import queue
+import shutil
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+
+try:
+    import uno
+    from com.sun.star.beans import PropertyValue
+    from com.sun.star.connection import NoConnectException
+except ImportError:
+    uno = None
+
+# Seconds to wait for a fresh soffice to accept UNO connections
+STARTUP_TIMEOUT = 60
+# Seconds a single job may run before its worker is killed
+DEFAULT_JOB_TIMEOUT = 120
+# Jobs that may wait for a free worker before submit() blocks
+DEFAULT_QUEUE_SIZE = 16
+
+# Export filter for --convert-to style targets given without one, by the
+# service the loaded document supports
+DEFAULT_FILTERS = {
+    "pdf": [
+        ("com.sun.star.presentation.PresentationDocument", "impress_pdf_Export"),
+        ("com.sun.star.sheet.SpreadsheetDocument", "calc_pdf_Export"),
+        ("com.sun.star.drawing.DrawingDocument", "draw_pdf_Export"),
+        ("com.sun.star.text.TextDocument", "writer_pdf_Export"),
+    ],
+    "html": [
+        ("com.sun.star.presentation.PresentationDocument", "impress_html_Export"),
+        ("com.sun.star.sheet.SpreadsheetDocument", "HTML (StarCalc)"),
+        ("com.sun.star.text.TextDocument", "HTML (StarWriter)"),
+    ],
+}
+
+_pool = None
+_pool_lock = threading.Lock()
+_pool_failed = False
+
+
+class PoolUnavailable(RuntimeError):
+    """Raised when no soffice worker can be started; callers should fall back."""
+
+
+def get_pool(size=None):
+    """Return the process-wide soffice pool, starting it on first use.
+
+    The pool is only started when SOFFICE_POOL_SIZE is set to a positive
+    number; it runs until this process exits.
+
+    Args:
+        size: Number of workers if the pool is started by this call
+            (default: SOFFICE_POOL_SIZE). Ignored once it is running.
+
+    Returns:
+        SofficePool, or None if the pool is disabled or cannot be started
+    """
+    global _pool, _pool_failed
+    with _pool_lock:
+        if _pool is not None or _pool_failed:
+            return _pool
+
+        configured = int(os.environ.get("SOFFICE_POOL_SIZE") or 0)
+        if configured <= 0:
+            size = 0
+        elif size is None:
+            size = configured
+        if uno is None or size <= 0 or shutil.which("soffice") is None:
+            _pool_failed = True
+            return None
+
+        try:
+            _pool = SofficePool(size=size)
+        except PoolUnavailable:
+            _pool_failed = True
+            return None
+        atexit.register(_pool.close)
+        return _pool
+
+
+class SofficePool:
+    """A fixed number of soffice workers fed from one bounded job queue.
+
+    Attributes:
+        size: Number of soffice workers
+    """
+
+    def __init__(self, size=1, queue_size=DEFAULT_QUEUE_SIZE):
+        """Start the workers.
+
+        Args:
+            size: Number of soffice processes to run
+            queue_size: Jobs that may wait for a worker before submit() blocks
+
+        Raises:
+            PoolUnavailable: If the first soffice worker cannot be started
+        """
+        self.size = size
+        self._jobs = queue.Queue(maxsize=queue_size)
+        self._closed = False
+        self._workers = [_SofficeWorker(index) for index in range(size)]
+
+        # Fail fast if soffice cannot run at all; the others start lazily
+        self._workers[0].start()
+
+        self._threads = [
+            threading.Thread(
+                target=self._serve,
+                args=(worker,),
+                name=f"soffice-worker-{worker.index}",
+                daemon=True,
+            )
+            for worker in self._workers
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, method, *args, timeout=DEFAULT_JOB_TIMEOUT):
+        """Queue a job and return a Future for its result.
+
+        Blocks while the queue is full.
+
+        Args:
+            method: Name of the _SofficeWorker method to run
+            *args: Arguments for the method
+            timeout: Seconds the job may run before its worker is killed
+
+        Returns:
+            concurrent.futures.Future
+        """
+        if self._closed:
+            raise PoolUnavailable("soffice pool is closed")
+        future = Future()
+        self._jobs.put((future, method, args, timeout))
+        return future
+
+    def convert(
+        self, input_path, output_dir, convert_to, timeout=DEFAULT_JOB_TIMEOUT
+    ):
+        """Convert a document like `soffice --convert-to`.
+
+        Args:
+            input_path: Document to convert
+            output_dir: Directory to write <stem>.<extension> into
+            convert_to: Target as passed to --convert-to, e.g. "pdf" or
+                "html:HTML (StarCalc)"
+            timeout: Seconds the conversion may take
+
+        Returns:
+            Path: The converted file
+
+        Raises:
+            PoolUnavailable: If no worker could be started
+            TimeoutError: If the conversion took longer than timeout
+            RuntimeError: If the document could not be loaded or exported
+        """
+        future = self.submit(
+            "convert", Path(input_path), Path(output_dir), convert_to, timeout=timeout
+        )
+        return future.result()
+
+    def recalculate(self, path, timeout=DEFAULT_JOB_TIMEOUT):
+        """Recalculate all formulas in a spreadsheet and save it in place.
+
+        Raises:
+            PoolUnavailable: If no worker could be started
+            TimeoutError: If recalculation took longer than timeout
+            RuntimeError: If the document could not be loaded or saved
+        """
+        future = self.submit("recalculate", Path(path), timeout=timeout)
+        return future.result()
+
+    def close(self):
+        """Stop accepting jobs and shut every soffice worker down."""
+        if self._closed:
+            return
+        self._closed = True
+        for _ in self._threads:
+            self._jobs.put(None)
+        for thread in self._threads:
+            thread.join(timeout=10)
+        for worker in self._workers:
+            worker.stop()
+
+    def _serve(self, worker):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            future, method, args, timeout = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(worker.run(method, args, timeout))
+            except BaseException as e:
+                future.set_exception(e)
+
+
+class _SofficeWorker:
+    """One headless soffice process with its own profile and UNO socket."""
+
+    def __init__(self, index):
+        self.index = index
+        self._process = None
+        self._profile_dir = None
+        self._desktop = None
+        self._timed_out = False
+
+    def start(self):
+        """Start soffice and connect to it.
+
+        Raises:
+            PoolUnavailable: If soffice does not accept connections in time
+        """
+        self.stop()
+        # A private profile lets several instances run side by side
+        self._profile_dir = tempfile.mkdtemp(prefix="soffice_pool_")
+        port = _free_port()
+        connection = (
+            f"socket,host=127.0.0.1,port={port};urp;StarOffice.ComponentContext"
+        )
+        try:
+            self._process = subprocess.Popen(
+                [
+                    "soffice",
+                    f"-env:UserInstallation={Path(self._profile_dir).as_uri()}",
+                    "--headless",
+                    "--invisible",
+                    "--nocrashreport",
+                    "--nodefault",
+                    "--nologo",
+                    "--norestore",
+                    f"--accept={connection}",
+                ],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        except OSError as e:
+            self.stop()
+            raise PoolUnavailable(f"Cannot start soffice: {e}") from e
+
+        local_context = uno.getComponentContext()
+        resolver = local_context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver", local_context
+        )
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while True:
+            if self._process.poll() is not None:
+                self.stop()
+                raise PoolUnavailable("soffice exited during startup")
+            try:
+                context = resolver.resolve(f"uno:{connection}")
+                break
+            except NoConnectException:
+                if time.monotonic() > deadline:
+                    self.stop()
+                    raise PoolUnavailable("soffice did not accept UNO connections")
+                time.sleep(0.1)
+
+        self._desktop = context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.frame.Desktop", context
+        )
+
+    def is_healthy(self):
+        """Return True if the process is alive and answers a UNO call."""
+        if self._process is None or self._process.poll() is not None:
+            return False
+        try:
+            self._desktop.getFrames()
+            return True
+        except Exception:
+            return False
+
+    def run(self, method, args, timeout):
+        """Run a job, restarting soffice first if it is not healthy.
+
+        A job that fails because soffice crashed is retried once on a
+        fresh process. A job that exceeds timeout kills the process.
+        """
+        for attempt in range(2):
+            if not self.is_healthy():
+                self.start()
+
+            self._timed_out = False
+            watchdog = threading.Timer(timeout, self._kill_for_timeout)
+            watchdog.start()
+            try:
+                return getattr(self, method)(*args)
+            except Exception:
+                if self._timed_out:
+                    raise TimeoutError(f"soffice job exceeded {timeout} s")
+                # Only retry if the failure was soffice going away
+                if attempt or self.is_healthy():
+                    raise
+            finally:
+                watchdog.cancel()
+
+    def convert(self, input_path, output_dir, convert_to):
+        extension, _, filter_name = convert_to.partition(":")
+        output_path = output_dir / f"{input_path.stem}.{extension}"
+        document = self._load(input_path)
+        try:
+            if not filter_name:
+                filter_name = _default_filter(document, extension)
+            document.storeToURL(
+                uno.systemPathToFileUrl(str(output_path.resolve())),
+                _properties(FilterName=filter_name),
+            )
+        finally:
+            document.close(True)
+        return output_path
+
+    def recalculate(self, path):
+        document = self._load(path)
+        try:
+            document.calculateAll()
+            document.store()
+        finally:
+            document.close(True)
+
+    def stop(self):
+        """Terminate soffice and remove its profile."""
+        if self._desktop is not None:
+            try:
+                self._desktop.terminate()
+            except Exception:
+                pass
+            self._desktop = None
+        if self._process is not None:
+            if self._process.poll() is None:
+                self._process.terminate()
+                try:
+                    self._process.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    self._process.kill()
+                    self._process.wait()
+            self._process = None
+        if self._profile_dir is not None:
+            shutil.rmtree(self._profile_dir, ignore_errors=True)
+            self._profile_dir = None
+
+    def _load(self, path):
+        url = uno.systemPathToFileUrl(str(Path(path).resolve()))
+        document = self._desktop.loadComponentFromURL(
+            url, "_blank", 0, _properties(Hidden=True)
+        )
+        if document is None:
+            raise RuntimeError(f"soffice could not load {path}")
+        return document
+
+    def _kill_for_timeout(self):
+        self._timed_out = True
+        if self._process is not None and self._process.poll() is None:
+            self._process.kill()
+
+
+def _default_filter(document, extension):
+    for service, filter_name in DEFAULT_FILTERS.get(extension, []):
+        if document.supportsService(service):
+            return filter_name
+    raise RuntimeError(f"No default export filter for .{extension}")
+
+
+def _properties(**values):
+    properties = []
+    for name, value in values.items():
+        prop = PropertyValue()
+        prop.Name = name
+        prop.Value = value
+        properties.append(prop)
+    return tuple(properties)
+
+
+def _free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")